@@ -37,8 +37,12 @@ def index(
     ),
     db: Path = typer.Option(None, "--db", help="SQLite database path"),
     model: str = typer.Option(AppConfig().model_name, help="Sentence-transformer model name"),
-    chunk_chars: int = typer.Option(AppConfig().chunk_chars, help="Chunk size in characters"),
-    overlap: int = typer.Option(AppConfig().overlap, help="Chunk overlap"),
+    chunk_chars: Optional[int] = typer.Option(
+        None, help="Chunk size in characters (default: chosen from page count)"
+    ),
+    overlap: Optional[int] = typer.Option(
+        None, help="Chunk overlap (default: chosen from page count)"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose logging"),
 ) -> None:
     """Index one or more paths containing documents (PDF, DOCX, MD, TXT)."""
@@ -64,7 +68,12 @@ def index(
         store.close()
         return
 
-    stats = indexer.index(doc_paths)
+    if store.get_stats()["document_count"] == 0:
+        # Fresh database: load everything before building the chunk index
+        with store.bulk_context():
+            stats = indexer.index(doc_paths)
+    else:
+        stats = indexer.index(doc_paths)
     console.print(
         f"Inserted: {stats.inserted}, updated: {stats.updated}, "
         f"skipped: {stats.skipped}, failed: {stats.failed}"
@@ -32,8 +32,9 @@ def _get_default_db_path() -> Path:
 class AppConfig:
     db_path: Path | None = None
     model_name: str = DEFAULT_MODEL
-    chunk_chars: int = 500
-    overlap: int = 50
+    # ``None`` lets the loader pick sizes from the document's page count.
+    chunk_chars: int | None = None
+    overlap: int | None = None
 
     def __post_init__(self) -> None:
         if self.db_path is None:
@@ -6,10 +6,12 @@ import logging
 import platform
 import sys
 from dataclasses import dataclass
-from typing import Iterable, Literal, Sequence
+from typing import TYPE_CHECKING, Iterable, Literal, Sequence
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 DEFAULT_MODEL = "sentence-transformers/all-mpnet-base-v2"
 
@@ -254,6 +256,10 @@ class EmbeddingModel:
 
     def _load_model(self) -> SentenceTransformer:
         """Load the SentenceTransformer model with appropriate backend settings."""
+        # Imported here so importing this module (e.g. for DEFAULT_MODEL) doesn't
+        # pull in sentence-transformers and torch until a model is needed.
+        from sentence_transformers import SentenceTransformer
+
         model_kwargs = {}
 
         # Add ONNX-specific model kwargs
@@ -315,5 +321,9 @@ class EmbeddingModel:
         return np.asarray(embeddings, dtype="float32")
 
     def embed_query(self, text: str) -> np.ndarray:
-        """Convenience wrapper for single-query embedding."""
+        """Convenience wrapper for single-query embedding.
+
+        Returns a C-contiguous float32 vector, which ``Searcher`` passes to the
+        store without copying.
+        """
         return self.embed([text])[0]
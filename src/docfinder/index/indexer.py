@@ -92,8 +92,8 @@ class Indexer:
         embedder: EmbeddingModel,
         store: SQLiteVectorStore,
         *,
-        chunk_chars: int = 1200,
-        overlap: int = 200,
+        chunk_chars: int | None = None,
+        overlap: int | None = None,
         embed_batch_size: int | None = None,
         progress_callback: Callable[[int, int, str], None] | None = None,
     ) -> None:
@@ -139,6 +139,18 @@ class Indexer:
         """
         return self.embed_batch_size is None
 
+    def _is_unchanged(self, path: Path) -> bool:
+        """Return True if *path* is indexed with the same mtime and size.
+
+        A matching stat is taken as unchanged content, which skips parsing
+        and hashing the file entirely.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return self.store.get_document_stat(path) == (stat.st_mtime, stat.st_size)
+
     def _index_sequential(
         self,
         doc_files: list[Path],
@@ -166,49 +178,61 @@ class Indexer:
         stats: IndexStats,
         total: int,
     ) -> None:
-        """Parse documents in parallel, then embed and store sequentially."""
-        num_workers = self._compute_parallel_workers(len(doc_files))
+        """Parse documents in parallel; embed and store each one as it arrives."""
+        # Unchanged files are settled up front so workers never parse them
+        pending: list[Path] = []
+        for path in doc_files:
+            if self._is_unchanged(path):
+                stats.increment("skipped", path)
+            else:
+                pending.append(path)
+        done = len(doc_files) - len(pending)
+        if not pending:
+            return
+
+        num_workers = self._compute_parallel_workers(len(pending))
         self.last_num_workers = num_workers
         LOGGER.info(
             "Parallel parsing %d documents with %d workers",
-            len(doc_files),
+            len(pending),
             num_workers,
         )
 
-        args = [(str(p), self.chunk_chars, self.overlap) for p in doc_files]
+        args = [(str(p), self.chunk_chars, self.overlap) for p in pending]
 
+        # Consume results as workers finish them, so embedding and storage of
+        # early documents overlap with parsing of the remaining ones.
         with ProcessPoolExecutor(max_workers=num_workers) as executor:
-            results = list(executor.map(_parse_document, args))
-
-        for i, result in enumerate(results):
-            path = doc_files[i]
-            if self.progress_callback:
-                self.progress_callback(i, total, str(path))
-            try:
-                if result is None:
-                    LOGGER.error("Worker returned None for %s", path)
+            results = executor.map(_parse_document, args)
+            for i, result in enumerate(results):
+                path = pending[i]
+                if self.progress_callback:
+                    self.progress_callback(done + i, total, str(path))
+                try:
+                    if result is None:
+                        LOGGER.error("Worker returned None for %s", path)
+                        stats.failed += 1
+                        stats.processed_files.append(path)
+                        continue
+
+                    if result["status"] == "error":
+                        LOGGER.error("Failed to parse %s: %s", path, result.get("error", "unknown"))
+                        stats.failed += 1
+                        stats.processed_files.append(path)
+                        continue
+
+                    if result["status"] == "empty":
+                        LOGGER.warning("No text extracted from %s", path)
+                        stats.increment("skipped", path)
+                        continue
+
+                    status = self._embed_and_store(path, result)
+                    stats.increment(status, path)
+                except Exception as e:
+                    LOGGER.error(f"Failed to process {path}: {e}")
                     stats.failed += 1
                     stats.processed_files.append(path)
-                    continue
-
-                if result["status"] == "error":
-                    LOGGER.error("Failed to parse %s: %s", path, result.get("error", "unknown"))
-                    stats.failed += 1
-                    stats.processed_files.append(path)
-                    continue
-
-                if result["status"] == "empty":
-                    LOGGER.warning("No text extracted from %s", path)
-                    stats.increment("skipped", path)
-                    continue
-
-                status = self._embed_and_store(path, result)
-                stats.increment(status, path)
-            except Exception as e:
-                LOGGER.error(f"Failed to process {path}: {e}")
-                stats.failed += 1
-                stats.processed_files.append(path)
-            gc.collect()
+                gc.collect()
 
     def _embed_and_store(self, path: Path, parsed: dict) -> str:
         """Embed pre-parsed chunks and store them in the database."""
@@ -274,6 +298,9 @@ class Indexer:
         """Index a single document file."""
         import itertools
 
+        if self._is_unchanged(path):
+            return "skipped"
+
         chunk_gen = build_chunks(path, max_chars=self.chunk_chars, overlap=self.overlap)
 
         try:
@@ -4,12 +4,41 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
+
+import numpy as np
 
 from docfinder.embedding.encoder import EmbeddingModel
 from docfinder.index.reranker import Reranker
-from docfinder.index.storage import SQLiteVectorStore
+from docfinder.index.storage import SQLiteVectorStore, StoreRow, decode_metadata
+
+try:
+    import orjson  # optional – faster metadata decoding if installed
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Shared result for rows without metadata (the common case); callers must not mutate it.
+_EMPTY: dict = {}
+
+
+def _parse_metadata(raw: str | bytes | None) -> dict:
+    """Decode stored metadata (JSON text or MessagePack), treating missing values as empty."""
+    if not raw or raw == "{}":
+        return _EMPTY
+    if isinstance(raw, bytes):
+        return decode_metadata(raw)
+    return _json_loads(raw)
+
+
+@lru_cache(maxsize=4096)
+def _to_path(raw: str) -> Path:
+    """Return a cached ``Path`` for *raw*; hot documents recur across queries."""
+    return Path(raw)
 
 
 @dataclass(slots=True)
@@ -45,50 +74,35 @@ class Searcher:
         # When reranking, fetch more candidates for the cross-encoder to evaluate
         fetch_k = max(top_k * 3, 30) if self.reranker is not None else top_k
 
-        embedding = self.embedder.embed_query(query)
+        # ``embed_query`` returns a contiguous float32 vector already, in which
+        # case both calls hand back the same buffer; they only copy for
+        # embedders that return float64 or strided views.
+        embedding = np.ascontiguousarray(
+            np.asarray(self.embedder.embed_query(query), dtype=np.float32)
+        )
         rows = self.store.search(embedding, top_k=fetch_k, folders=folders)
 
         if self.reranker is not None and rows:
-            # Build dicts for the reranker
-            candidates = []
-            for row in rows:
-                candidates.append(
-                    {
-                        "path": row["path"],
-                        "title": row["title"],
-                        "chunk_index": row["chunk_index"],
-                        "score": float(row["score"]),
-                        "text": row["text"],
-                        "metadata": row.get("metadata"),
-                    }
-                )
+            # The reranker scores and reorders plain dicts
+            candidates = [row._asdict() for row in rows]
             reranked = self.reranker.rerank(query, candidates, top_k=top_k)
-            results: List[SearchResult] = []
-            for r in reranked:
-                metadata = json.loads(r["metadata"]) if r.get("metadata") else {}
-                results.append(
-                    SearchResult(
-                        path=Path(r["path"]),
-                        title=r["title"],
-                        chunk_index=r["chunk_index"],
-                        score=float(r["score"]),
-                        text=r["text"],
-                        metadata=metadata,
-                    )
-                )
-            return results
-
-        results = []
-        for row in rows:
-            metadata = json.loads(row["metadata"]) if row.get("metadata") else {}
-            results.append(
-                SearchResult(
-                    path=Path(row["path"]),
-                    title=row["title"],
-                    chunk_index=row["chunk_index"],
-                    score=float(row["score"]),
-                    text=row["text"],
-                    metadata=metadata,
-                )
+            return self._to_results(
+                StoreRow._make(r[f] for f in StoreRow._fields) for r in reranked
+            )
+
+        return self._to_results(rows)
+
+    @staticmethod
+    def _to_results(rows: Iterable[StoreRow]) -> List[SearchResult]:
+        """Convert store rows into ``SearchResult`` objects."""
+        return [
+            SearchResult(
+                path=_to_path(row.path),
+                title=row.title,
+                chunk_index=row.chunk_index,
+                score=float(row.score),
+                text=row.text,
+                metadata=_parse_metadata(row.metadata),
             )
-        return results
+            for row in rows
+        ]
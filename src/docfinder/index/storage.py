@@ -3,43 +3,331 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path, PurePosixPath
-from typing import Iterator, List, Sequence
+from typing import Iterable, Iterator, List, NamedTuple, Sequence
 
 import numpy as np
 
 from docfinder.models import ChunkRecord, DocumentMetadata
 
+try:
+    import zstandard  # optional – compressed chunk text
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack  # optional – compact binary chunk metadata
+except ImportError:
+    msgpack = None
+
+try:
+    import sqlite_vec  # optional – in-database vector search
+except ImportError:
+    sqlite_vec = None
+
+logger = logging.getLogger(__name__)
+
+_CREATE_CHUNK_DOCUMENT_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks(document_id)"
+)
+
+# Rows scored per block when dequantizing int8 embeddings during search.
+_QUANT_BLOCK = 8192
+# With quantization, this many candidates per requested hit are rescored exactly.
+_RESCORE_FACTOR = 4
+# sqlite-vec caps the ``k`` of a KNN query; larger requests use the in-memory scan.
+_VEC_MAX_K = 4096
+
+
+class StoreRow(NamedTuple):
+    """A single search hit as returned by ``SQLiteVectorStore.search``."""
+
+    path: str
+    title: str | None
+    chunk_index: int
+    score: float
+    text: str
+    metadata: str | bytes | None  # JSON text, or MessagePack with pack_metadata
+    document_id: int
+
+
+def _quantize_rows(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return int8 rows and per-row float32 scales such that ``row ≈ q * scale``."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _scores(matrix: np.ndarray, scales: np.ndarray | None, query: np.ndarray) -> np.ndarray:
+    """Dot *query* against every row of *matrix*, dequantizing int8 rows blockwise."""
+    if scales is None:
+        return matrix @ query
+    out = np.empty(len(matrix), dtype=np.float32)
+    for start in range(0, len(matrix), _QUANT_BLOCK):
+        block = matrix[start : start + _QUANT_BLOCK]
+        out[start : start + len(block)] = block.astype(np.float32) @ query
+    return out * scales
+
+
+def _decode_text(value: str | bytes) -> str:
+    """Return chunk text, decompressing it if it was stored as a zstd BLOB."""
+    if isinstance(value, bytes):
+        if zstandard is None:
+            raise RuntimeError(
+                "This index stores compressed chunk text; install it with: pip install zstandard"
+            )
+        return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+    return value
+
+
+def decode_metadata(value: str | bytes | None) -> dict:
+    """Return chunk metadata as a dict, whether stored as JSON text or a MessagePack BLOB."""
+    if not value:
+        return {}
+    if isinstance(value, bytes):
+        if msgpack is None:
+            raise RuntimeError(
+                "This index stores MessagePack metadata; install it with: pip install msgpack"
+            )
+        return msgpack.unpackb(value, raw=False)
+    return json.loads(value)
+
+
+def _load_sqlite_vec(conn: sqlite3.Connection) -> bool:
+    """Load the sqlite-vec extension into *conn*, returning whether it is available."""
+    if sqlite_vec is None or not hasattr(conn, "enable_load_extension"):
+        return False
+    try:
+        conn.enable_load_extension(True)
+        try:
+            sqlite_vec.load(conn)
+        finally:
+            conn.enable_load_extension(False)
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the *k* highest scores, best first.
+
+    ``argpartition`` selects the top *k* in O(N); only those *k* are sorted.
+    """
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(scores.size)
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# Stores handed out by ``SQLiteVectorStore.open``, keyed by path and options.
+_OPEN_STORES: dict[tuple, "SQLiteVectorStore"] = {}
+_OPEN_STORES_LOCK = threading.Lock()
+
 
 class SQLiteVectorStore:
-    """Persistence layer for document and chunk embeddings."""
+    """Persistence layer for document and chunk embeddings.
+
+    With ``quantize=True`` the in-memory search matrix holds int8 rows with a
+    per-row scale (a quarter of the float32 footprint); the best candidates
+    are then rescored against the exact float32 embeddings stored on disk.
+
+    With ``compress_text=True`` (requires ``zstandard``) new chunk text is
+    stored as zstd BLOBs. Reads handle plain and compressed rows alike, so
+    the flag can change between runs on the same database.
+
+    Likewise ``pack_metadata=True`` (requires ``msgpack``) stores new chunk
+    metadata as MessagePack BLOBs instead of JSON text; ``decode_metadata``
+    reads either form.
+
+    With ``vector_index=True`` (requires ``sqlite-vec`` and a Python whose
+    ``sqlite3`` can load extensions) embeddings are mirrored into a ``vec0``
+    virtual table and unfiltered searches run as a KNN query inside SQLite.
+    The ``chunks.embedding`` BLOBs stay authoritative: if the extension cannot
+    be loaded the store falls back to the in-memory scan, and the mirror is
+    brought back in sync the next time it is opened with the extension.
+    """
+
+    # Hot statements are kept as fixed strings so every call hits the
+    # connection's prepared-statement cache instead of re-parsing SQL.
+    _SQL_FIND_DOC = (
+        "SELECT id, sha256, mtime, size FROM documents WHERE REPLACE(path, '\\', '/') = ?"
+    )
+    _SQL_INSERT_DOC = (
+        "INSERT INTO documents(path, title, sha256, mtime, size) VALUES (?, ?, ?, ?, ?)"
+    )
+    _SQL_INSERT_CHUNK = (
+        "INSERT INTO chunks(document_id, chunk_index, text, metadata, embedding)"
+        " VALUES (?, ?, ?, ?, ?)"
+    )
+    _SQL_DELETE_DOC_CHUNKS = "DELETE FROM chunks WHERE document_id = ?"
+    _SQL_DELETE_DOC = "DELETE FROM documents WHERE id = ?"
+    _SQL_LOAD_MATRIX = "SELECT id, document_id, embedding FROM chunks ORDER BY id"
+    _SQL_MAX_CHUNK_ID = "SELECT COALESCE(MAX(id), 0) FROM chunks"
+    _SQL_VEC_INSERT_NEW = (
+        "INSERT INTO chunk_vec(rowid, embedding) SELECT id, embedding FROM chunks"
+        " WHERE document_id = ? AND id > ?"
+    )
+    _SQL_VEC_DELETE_DOC = (
+        "DELETE FROM chunk_vec WHERE rowid IN (SELECT id FROM chunks WHERE document_id = ?)"
+    )
+    _SQL_VEC_SEARCH = (
+        "SELECT rowid, distance FROM chunk_vec WHERE embedding MATCH ? AND k = ? ORDER BY distance"
+    )
+    _SQL_CREATE_HITS = (
+        "CREATE TEMP TABLE IF NOT EXISTS _search_hits"
+        "(rank INTEGER PRIMARY KEY, chunk_id INTEGER NOT NULL)"
+    )
+    _SQL_INSERT_HIT = "INSERT INTO _search_hits(rank, chunk_id) VALUES (?, ?)"
+    _SQL_FETCH_HITS_TEMPLATE = """
+        SELECT
+            h.rank AS rank,
+            c.document_id AS document_id,
+            d.path AS path,
+            d.title AS title,
+            c.chunk_index AS chunk_index,
+            c.text AS text,
+            c.metadata AS metadata{embedding}
+        FROM _search_hits h
+        JOIN chunks c ON c.id = h.chunk_id
+        JOIN documents d ON d.id = c.document_id
+        ORDER BY h.rank
+        """
+    _SQL_FETCH_HITS = _SQL_FETCH_HITS_TEMPLATE.format(embedding="")
+    _SQL_FETCH_HITS_EMBEDDING = _SQL_FETCH_HITS_TEMPLATE.format(
+        embedding=", c.embedding AS embedding"
+    )
 
-    def __init__(self, db_path: Path, *, dimension: int) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        dimension: int,
+        quantize: bool = False,
+        compress_text: bool = False,
+        pack_metadata: bool = False,
+        vector_index: bool = False,
+        check_same_thread: bool = True,
+    ) -> None:
+        if compress_text and zstandard is None:
+            raise ImportError("compress_text=True requires zstandard: pip install zstandard")
+        if pack_metadata and msgpack is None:
+            raise ImportError("pack_metadata=True requires msgpack: pip install msgpack")
         self.db_path = Path(db_path)
         self.dimension = dimension
-        self._conn = sqlite3.connect(self.db_path)
+        self.quantize = quantize
+        self.compress_text = compress_text
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress_text else None
+        self.pack_metadata = pack_metadata
+        self._conn = sqlite3.connect(
+            self.db_path, cached_statements=256, check_same_thread=check_same_thread
+        )
+        # Serialises transactions and search hydration when a store is shared
+        # between threads (see ``open``); re-entrant for nested use.
+        self._lock = threading.RLock()
+        self._cache_key: tuple | None = None
+        self._refs = 0
         self._conn.row_factory = sqlite3.Row
+        # page_size only takes effect on a new database, before WAL is enabled
+        self._conn.execute("PRAGMA page_size=8192;")
         self._conn.execute("PRAGMA journal_mode=WAL;")
         self._conn.execute("PRAGMA synchronous=NORMAL;")
+        # Read through up to 256 MiB of memory-mapped file instead of read()
+        # calls, keep up to 64 MiB of pages cached, and sort/index in memory.
+        self._conn.execute("PRAGMA mmap_size=268435456;")
+        self._conn.execute("PRAGMA cache_size=-65536;")
+        self._conn.execute("PRAGMA temp_store=MEMORY;")
+        # (chunk_ids, document_ids, embeddings, int8 scales) loaded lazily by ``search``
+        self._matrix: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None] | None = None
+        self._matrix_version: int | None = None
         self._ensure_schema()
+        self._conn.execute(self._SQL_CREATE_HITS)
+        self.vector_index = False
+        if vector_index:
+            if _load_sqlite_vec(self._conn):
+                self.vector_index = True
+                self._sync_vector_index()
+            else:
+                logger.warning(
+                    "sqlite-vec is unavailable (pip install sqlite-vec); "
+                    "using in-memory vector search"
+                )
 
     @property
     def connection(self) -> sqlite3.Connection:
         return self._conn
 
+    @classmethod
+    def open(cls, db_path: Path, *, dimension: int, **options) -> "SQLiteVectorStore":
+        """Return a shared, reference-counted store for *db_path*.
+
+        Callers in the same process opening the same database (and options)
+        get one long-lived connection, along with its statement cache and
+        search matrix. Each ``open`` must be paired with a ``close``; the
+        connection is closed when the last holder releases it. The shared
+        connection may be used from several threads.
+        """
+        key = (os.path.realpath(db_path), dimension, tuple(sorted(options.items())))
+        with _OPEN_STORES_LOCK:
+            store = _OPEN_STORES.get(key)
+            if store is None:
+                store = cls(db_path, dimension=dimension, check_same_thread=False, **options)
+                store._cache_key = key
+                _OPEN_STORES[key] = store
+            store._refs += 1
+            return store
+
     def close(self) -> None:
+        if self._cache_key is not None:
+            with _OPEN_STORES_LOCK:
+                self._refs -= 1
+                if self._refs > 0:
+                    return
+                _OPEN_STORES.pop(self._cache_key, None)
         self._conn.close()
 
     @contextmanager
     def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                self._invalidate_matrix()
+                raise
+
+    @contextmanager
+    def bulk_context(self) -> Iterator["SQLiteVectorStore"]:
+        """Defer index maintenance and fsyncs while loading many documents.
+
+        Drops ``idx_chunks_document_id`` and sets ``synchronous=OFF`` for the
+        duration, then rebuilds the index in one pass and restores
+        ``synchronous=NORMAL`` on exit. WAL stays on, so if the process dies
+        mid-load the database is still intact; an OS crash or power loss,
+        however, can lose commits or corrupt it, since nothing is fsynced.
+        Intended for initial ingests into a database that can be rebuilt:
+        replacing existing documents has to scan ``chunks`` while the index
+        is gone.
+        """
+        with self.transaction() as conn:
+            conn.execute("DROP INDEX IF EXISTS idx_chunks_document_id")
+        self._conn.execute("PRAGMA synchronous=OFF;")
         try:
-            yield self._conn
-            self._conn.commit()
-        except Exception:
-            self._conn.rollback()
-            raise
+            yield self
+        finally:
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            with self.transaction() as conn:
+                conn.execute(_CREATE_CHUNK_DOCUMENT_INDEX)
 
     def _ensure_schema(self) -> None:
         with self.transaction() as conn:
@@ -73,18 +361,14 @@ class SQLiteVectorStore:
                     document_id INTEGER NOT NULL,
                     chunk_index INTEGER NOT NULL,
                     text TEXT NOT NULL,
-                    metadata TEXT,
+                    metadata BLOB,
                     embedding BLOB NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY(document_id) REFERENCES documents(id) ON DELETE CASCADE
                 )
                 """
             )
-            conn.execute(
-                """CREATE INDEX IF NOT EXISTS idx_chunks_document_id
-                    ON chunks(document_id)
-                """
-            )
+            conn.execute(_CREATE_CHUNK_DOCUMENT_INDEX)
             # Clean up legacy vector tables if present
             conn.execute("DROP TABLE IF EXISTS chunk_index")
             conn.execute("DROP TABLE IF EXISTS chunk_index_data")
@@ -94,6 +378,30 @@ class SQLiteVectorStore:
             if "embedding" not in columns:
                 conn.execute("ALTER TABLE chunks ADD COLUMN embedding BLOB")
 
+    def _sync_vector_index(self) -> None:
+        """Create the ``chunk_vec`` mirror and reconcile it with ``chunks``.
+
+        Stores opened without the extension write only to ``chunks``, so rows
+        they added or removed are caught up here.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS chunk_vec USING "
+                f"vec0(embedding float[{self.dimension}] distance_metric=cosine)"
+            )
+            conn.execute("DELETE FROM chunk_vec WHERE rowid NOT IN (SELECT id FROM chunks)")
+            conn.execute(
+                "INSERT INTO chunk_vec(rowid, embedding) SELECT id, embedding FROM chunks"
+                " WHERE id NOT IN (SELECT rowid FROM chunk_vec)"
+            )
+
+    def _delete_chunks(self, doc_ids: Sequence[tuple[int]]) -> None:
+        """Delete the chunks of every ``(document_id,)`` in *doc_ids*."""
+        # Note: This should be called within a transaction
+        if self.vector_index:
+            self._conn.executemany(self._SQL_VEC_DELETE_DOC, doc_ids)
+        self._conn.executemany(self._SQL_DELETE_DOC_CHUNKS, doc_ids)
+
     @staticmethod
     def _normalize_path(path: str | Path) -> str:
         """Return a separator-stable representation for stored paths."""
@@ -107,6 +415,44 @@ class SQLiteVectorStore:
             normalized = normalized[:-1]
         return normalized
 
+    def _invalidate_matrix(self) -> None:
+        self._matrix = None
+
+    def _embedding_matrix(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+        """Return cached ``(chunk_ids, document_ids, embeddings, scales)`` for all chunks.
+
+        ``scales`` is ``None`` unless the store quantizes, in which case
+        ``embeddings`` is int8.
+
+        The cache is dropped by this store's own writes and reloaded when
+        ``PRAGMA data_version`` shows another connection has committed.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._matrix is None or version != self._matrix_version:
+                rows = self._conn.execute(self._SQL_LOAD_MATRIX).fetchall()
+                count = len(rows)
+                ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+                doc_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=count)
+                if rows:
+                    blob = b"".join(row[2] for row in rows)
+                    matrix = np.frombuffer(blob, dtype=np.float32).reshape(count, -1)
+                else:
+                    matrix = np.empty((0, self.dimension), dtype=np.float32)
+                scales = None
+                if self.quantize:
+                    matrix, scales = _quantize_rows(matrix)
+                self._matrix = (ids, doc_ids, matrix, scales)
+                self._matrix_version = version
+            return self._matrix
+
+    def get_document_stat(self, path: str | Path) -> tuple[float, int] | None:
+        """Return the stored ``(mtime, size)`` for *path*, or ``None`` if not indexed."""
+        row = self._conn.execute(self._SQL_FIND_DOC, (self._normalize_path(path),)).fetchone()
+        return (row["mtime"], row["size"]) if row else None
+
     def init_document(self, document: DocumentMetadata) -> tuple[int, str]:
         """Initialize a document for insertion.
 
@@ -118,22 +464,26 @@ class SQLiteVectorStore:
         conn = self._conn
 
         existing = conn.execute(
-            "SELECT id, sha256 FROM documents WHERE REPLACE(path, '\\', '/') = ?",
-            (self._normalize_path(document.path),),
+            self._SQL_FIND_DOC, (self._normalize_path(document.path),)
         ).fetchone()
 
         if existing and existing["sha256"] == document.sha256:
+            if (existing["mtime"], existing["size"]) != (document.mtime, document.size):
+                # Same content under a new stat (e.g. touched): record it so the
+                # next run can skip this file on stat alone
+                conn.execute(
+                    "UPDATE documents SET mtime = ?, size = ? WHERE id = ?",
+                    (document.mtime, document.size, existing["id"]),
+                )
             return -1, "skipped"
 
+        self._invalidate_matrix()
         if existing:
-            conn.execute("DELETE FROM chunks WHERE document_id = ?", (existing["id"],))
-            conn.execute("DELETE FROM documents WHERE id = ?", (existing["id"],))
+            self._delete_chunks([(existing["id"],)])
+            conn.execute(self._SQL_DELETE_DOC, (existing["id"],))
 
         doc_id = conn.execute(
-            """
-            INSERT INTO documents(path, title, sha256, mtime, size)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+            self._SQL_INSERT_DOC,
             (
                 str(document.path),
                 document.title,
@@ -151,23 +501,50 @@ class SQLiteVectorStore:
         """Insert a batch of chunks for a document."""
         if embeddings.shape[0] != len(chunks):
             raise ValueError("Embeddings and chunks length mismatch")
-
-        data = [
+        if not chunks:
+            return
+        self._invalidate_matrix()
+
+        # Rows are stored L2-normalized so search scores are a plain dot product
+        # (cosine) with no per-row norm work at query time. The copy is owned,
+        # so normalizing in place leaves the caller's array untouched.
+        matrix = np.array(embeddings, dtype=np.float32, order="C")
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True).clip(min=1e-12)
+
+        # One contiguous float32 buffer sliced per row: sqlite3 binds memoryview
+        # slices as BLOBs directly, so no per-row ``bytes`` copy is made.
+        buf = memoryview(matrix).cast("B")
+        stride = matrix.strides[0]
+
+        # Write rows in chunk_index order so ``(document_id, chunk_index)``
+        # keys are appended to the B-tree rather than split into its pages.
+        order: Sequence[int] = range(len(chunks))
+        if any(chunks[i].index > chunks[i + 1].index for i in range(len(chunks) - 1)):
+            order = sorted(order, key=lambda i: chunks[i].index)
+
+        # A generator lets ``executemany`` bind rows as it steps the statement,
+        # so the whole batch is never materialised as a list of tuples.
+        compress = self._compressor.compress if self._compressor is not None else None
+        pack = self.pack_metadata
+        data = (
             (
                 doc_id,
-                chunk.index,
-                chunk.text,
-                json.dumps(chunk.metadata, ensure_ascii=True),
-                sqlite3.Binary(np.asarray(vector, dtype="float32").tobytes()),
+                chunks[i].index,
+                compress(chunks[i].text.encode("utf-8")) if compress else chunks[i].text,
+                msgpack.packb(chunks[i].metadata, use_bin_type=True)
+                if pack
+                else json.dumps(chunks[i].metadata, ensure_ascii=True),
+                buf[i * stride : (i + 1) * stride],
             )
-            for chunk, vector in zip(chunks, embeddings)
-        ]
-        sql = (
-            "INSERT INTO chunks"
-            "(document_id, chunk_index, text, metadata, embedding)"
-            " VALUES (?, ?, ?, ?, ?)"
+            for i in order
         )
-        self._conn.executemany(sql, data)
+        # Documents arrive in several batches; only this call's rows (ids above
+        # the pre-insert maximum) are new to chunk_vec.
+        if self.vector_index:
+            last_id = self._conn.execute(self._SQL_MAX_CHUNK_ID).fetchone()[0]
+        self._conn.executemany(self._SQL_INSERT_CHUNK, data)
+        if self.vector_index:
+            self._conn.execute(self._SQL_VEC_INSERT_NEW, (doc_id, last_id))
 
     def upsert_document(
         self,
@@ -176,35 +553,61 @@ class SQLiteVectorStore:
         embeddings: np.ndarray,
     ) -> str:
         with self.transaction():
-            doc_id, status = self.init_document(document)
-            if status == "skipped":
-                return status
+            return self._upsert_one(document, chunks, embeddings)
+
+    def bulk_upsert(
+        self,
+        items: Iterable[tuple[DocumentMetadata, Sequence[ChunkRecord], np.ndarray]],
+    ) -> List[str]:
+        """Upsert many ``(document, chunks, embeddings)`` items in one transaction.
+
+        A single commit (and WAL sync) covers the whole batch instead of one
+        per document. Any failure rolls back every item in the batch.
+        """
+        with self.transaction():
+            return [
+                self._upsert_one(document, chunks, embeddings)
+                for document, chunks, embeddings in items
+            ]
 
-            self.insert_chunks(doc_id, chunks, embeddings)
+    def _upsert_one(
+        self,
+        document: DocumentMetadata,
+        chunks: Sequence[ChunkRecord],
+        embeddings: np.ndarray,
+    ) -> str:
+        # Note: This should be called within a transaction
+        doc_id, status = self.init_document(document)
+        if status == "skipped":
             return status
 
+        self.insert_chunks(doc_id, chunks, embeddings)
+        return status
+
     def search(
         self,
         embedding: np.ndarray,
         *,
         top_k: int = 10,
         folders: Sequence[str] | None = None,
-    ) -> List[dict]:
+    ) -> List[StoreRow]:
+        # Stored rows are unit-length, so normalizing the query makes the dot
+        # product a cosine similarity.
         query = np.asarray(embedding, dtype="float32")
-        sql = """
-            SELECT
-                c.document_id AS document_id,
-                d.path AS path,
-                d.title AS title,
-                c.chunk_index AS chunk_index,
-                c.text AS text,
-                c.metadata AS metadata,
-                c.embedding AS embedding
-            FROM chunks c
-            JOIN documents d ON d.id = c.document_id
-            """
-        params: list[str] = []
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+        if self.vector_index and folders is None and not self.quantize:
+            if top_k <= 0:
+                return []
+            if top_k <= _VEC_MAX_K:
+                return self._search_vector_index(query, top_k)
+
+        chunk_ids, doc_ids, matrix, scales = self._embedding_matrix()
+        if not len(chunk_ids):
+            return []
 
+        candidates: np.ndarray | None = None
         if folders is not None:
             normalized = sorted(
                 {
@@ -217,42 +620,93 @@ class SQLiteVectorStore:
                 return []
 
             clauses: list[str] = []
+            params: list[str] = []
             for folder in normalized:
-                clauses.append(
-                    "(REPLACE(d.path, '\\', '/') = ? OR REPLACE(d.path, '\\', '/') LIKE ?)"
-                )
+                clauses.append("(REPLACE(path, '\\', '/') = ? OR REPLACE(path, '\\', '/') LIKE ?)")
                 params.extend([folder, f"{folder}/%"])
-            sql += " WHERE " + " OR ".join(clauses)
-
-        rows = self._conn.execute(sql, params).fetchall()
-
-        if not rows:
+            allowed = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM documents WHERE " + " OR ".join(clauses), params
+                )
+            ]
+            candidates = np.flatnonzero(np.isin(doc_ids, allowed))
+            if not len(candidates):
+                return []
+            matrix = matrix[candidates]
+            if scales is not None:
+                scales = scales[candidates]
+
+        scores = _scores(matrix, scales, query)
+        pool = top_k if scales is None else top_k * _RESCORE_FACTOR
+        top_indices = _top_k_indices(scores, pool)
+        if not len(top_indices):
             return []
 
-        embeddings = np.vstack([np.frombuffer(row["embedding"], dtype="float32") for row in rows])
-        scores = embeddings @ query
+        positions = top_indices if candidates is None else candidates[top_indices]
+        rows = self._fetch_hits(chunk_ids[positions].tolist(), with_embedding=scales is not None)
+        hits = [(float(scores[top_indices[row["rank"]]]), row) for row in rows]
+        if scales is not None:
+            # Rank the approximate candidates by their exact float32 scores
+            hits = [
+                (float(np.frombuffer(row["embedding"], dtype=np.float32) @ query), row)
+                for _, row in hits
+            ]
+            hits.sort(key=lambda hit: hit[0], reverse=True)
+            hits = hits[:top_k]
 
-        if top_k < len(scores):
-            top_indices = np.argpartition(scores, -top_k)[-top_k:]
-            top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
-        else:
-            top_indices = np.argsort(scores)[::-1]
+        return [
+            StoreRow(
+                path=row["path"],
+                title=row["title"],
+                chunk_index=row["chunk_index"],
+                score=score,
+                text=_decode_text(row["text"]),
+                metadata=row["metadata"],
+                document_id=row["document_id"],
+            )
+            for score, row in hits
+        ]
 
-        results: List[dict] = []
-        for idx in top_indices:
-            row = rows[idx]
-            results.append(
-                {
-                    "document_id": row["document_id"],
-                    "path": row["path"],
-                    "title": row["title"],
-                    "chunk_index": row["chunk_index"],
-                    "text": row["text"],
-                    "metadata": row["metadata"],
-                    "score": float(scores[idx]),
-                }
+    def _search_vector_index(self, query: np.ndarray, top_k: int) -> List[StoreRow]:
+        """Run an unfiltered KNN query against the ``chunk_vec`` table."""
+        matches = self._conn.execute(
+            self._SQL_VEC_SEARCH, (np.ascontiguousarray(query).tobytes(), top_k)
+        ).fetchall()
+        if not matches:
+            return []
+        rows = self._fetch_hits([m[0] for m in matches], with_embedding=False)
+        return [
+            StoreRow(
+                path=row["path"],
+                title=row["title"],
+                chunk_index=row["chunk_index"],
+                # cosine distance -> similarity, the score the in-memory scan reports
+                score=1.0 - float(matches[row["rank"]][1]),
+                text=_decode_text(row["text"]),
+                metadata=row["metadata"],
+                document_id=row["document_id"],
             )
-        return results
+            for row in rows
+        ]
+
+    def _fetch_hits(self, chunk_ids: list[int], *, with_embedding: bool) -> list[sqlite3.Row]:
+        """Load rows for *chunk_ids* in rank order with one fixed join query.
+
+        The ids go into a temp table rather than an ``IN (?, ...)`` list, so
+        the statement text never depends on ``top_k`` and stays cached.
+        """
+        with self._lock:
+            started = not self._conn.in_transaction
+            try:
+                self._conn.execute("DELETE FROM _search_hits")
+                self._conn.executemany(self._SQL_INSERT_HIT, enumerate(chunk_ids))
+                sql = self._SQL_FETCH_HITS_EMBEDDING if with_embedding else self._SQL_FETCH_HITS
+                return self._conn.execute(sql).fetchall()
+            finally:
+                # Don't leave an implicit transaction (and its read snapshot) open
+                if started and self._conn.in_transaction:
+                    self._conn.commit()
 
     def list_indexed_directories(self) -> List[dict]:
         """Return indexed parent directories and document counts."""
@@ -284,7 +738,11 @@ class SQLiteVectorStore:
             (document_id,),
         ).fetchall()
         return [
-            {"chunk_index": row["chunk_index"], "text": row["text"], "metadata": row["metadata"]}
+            {
+                "chunk_index": row["chunk_index"],
+                "text": _decode_text(row["text"]),
+                "metadata": row["metadata"],
+            }
             for row in rows
         ]
 
@@ -315,7 +773,7 @@ class SQLiteVectorStore:
         return [
             {
                 "chunk_index": row["chunk_index"],
-                "text": row["text"],
+                "text": _decode_text(row["text"]),
                 "metadata": row["metadata"],
             }
             for row in rows
@@ -349,12 +807,12 @@ class SQLiteVectorStore:
         # Parse page numbers from metadata
         chunks_with_page = []
         for row in rows:
-            meta = json.loads(row["metadata"]) if row["metadata"] else {}
+            meta = decode_metadata(row["metadata"])
             page = meta.get("page", 0)
             chunks_with_page.append(
                 {
                     "chunk_index": row["chunk_index"],
-                    "text": row["text"],
+                    "text": _decode_text(row["text"]),
                     "metadata": row["metadata"],
                     "page": page,
                 }
@@ -399,15 +857,40 @@ class SQLiteVectorStore:
             for c in collected
         ]
 
+    @staticmethod
+    def _missing_paths(paths: Iterable[str]) -> set[str]:
+        """Return the subset of *paths* that no longer exist on disk.
+
+        Lists each parent directory once instead of stat-ing every file.
+        Names absent from the listing are confirmed with ``os.path.exists``
+        so case-insensitive filesystems don't report false positives.
+        """
+        by_parent: dict[str, list[str]] = {}
+        for path in paths:
+            by_parent.setdefault(os.path.dirname(path), []).append(path)
+
+        missing: set[str] = set()
+        for parent, children in by_parent.items():
+            try:
+                names = set(os.listdir(parent or "."))
+            except OSError:
+                names = set()
+            for path in children:
+                if os.path.basename(path) not in names and not os.path.exists(path):
+                    missing.add(path)
+        return missing
+
     def remove_missing_files(self) -> int:
         """Remove documents whose files no longer exist."""
         with self.transaction() as conn:
             rows = conn.execute("SELECT id, path FROM documents").fetchall()
-            missing = [row for row in rows if not Path(row["path"]).exists()]
-            for row in missing:
-                conn.execute("DELETE FROM chunks WHERE document_id = ?", (row["id"],))
-                conn.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
-        return len(missing)
+            gone = self._missing_paths(row["path"] for row in rows)
+            missing_ids = [(row["id"],) for row in rows if row["path"] in gone]
+            if missing_ids:
+                self._invalidate_matrix()
+                self._delete_chunks(missing_ids)
+                conn.executemany(self._SQL_DELETE_DOC, missing_ids)
+        return len(missing_ids)
 
     def list_documents(self) -> List[dict]:
         """List all indexed documents with their metadata."""
@@ -456,8 +939,9 @@ class SQLiteVectorStore:
             if not existing:
                 return False
 
-            conn.execute("DELETE FROM chunks WHERE document_id = ?", (doc_id,))
-            conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            self._invalidate_matrix()
+            self._delete_chunks([(doc_id,)])
+            conn.execute(self._SQL_DELETE_DOC, (doc_id,))
             return True
 
     def delete_document_by_path(self, path: str) -> bool:
@@ -476,8 +960,9 @@ class SQLiteVectorStore:
                 return False
 
             doc_id = existing["id"]
-            conn.execute("DELETE FROM chunks WHERE document_id = ?", (doc_id,))
-            conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            self._invalidate_matrix()
+            self._delete_chunks([(doc_id,)])
+            conn.execute(self._SQL_DELETE_DOC, (doc_id,))
             return True
 
     def get_stats(self) -> dict:
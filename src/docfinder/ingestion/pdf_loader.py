@@ -7,7 +7,9 @@ and Word documents (.docx via python-docx).
 from __future__ import annotations
 
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, Iterator
 
@@ -95,24 +97,62 @@ def _extract_page_text(page) -> str:
     return "\n\n".join(part[1] for part in all_parts)
 
 
-def iter_text_parts(path: Path) -> Iterator[str]:
-    """Yield text content from a PDF file, page by page."""
+def _open_pdf(path: Path) -> "fitz.Document | None":
+    """Open *path* with PyMuPDF, logging and returning ``None`` on failure."""
+    # Open by path rather than ``fitz.open(stream=...)``: MuPDF then reads
+    # objects lazily through the OS page cache, whereas stream mode needs the
+    # whole file as ``bytes`` (PyMuPDF rejects ``mmap`` buffers outright).
     try:
-        doc = fitz.open(path)
+        return fitz.open(path)
     except Exception as exc:
         LOGGER.error("Failed to open PDF %s: %s", path, exc)
-        return
+        return None
 
+
+def _safe_extract(doc, index: int) -> tuple[str, str | None]:
+    """Return ``(normalized_text, error)`` for page *index*; never raises."""
+    try:
+        return normalize_whitespace([_extract_page_text(doc[index])]), None
+    except Exception as exc:
+        return "", f"page {index}: {exc}"
+
+
+def _iter_pdf_pages(doc, path: Path) -> Iterator[tuple[int, str]]:
+    """Yield ``(page_number, text)`` from an already open PDF (1-based pages).
+
+    Pages that fail to extract are skipped and reported in a single warning
+    once iteration ends, instead of one log call per bad page.
+    """
+    errors: list[str] = []
     try:
         for index in range(len(doc)):
-            try:
-                page = doc[index]
-                text = _extract_page_text(page)
-                normalized = normalize_whitespace([text])
-                if normalized:
-                    yield normalized + "\n"
-            except Exception as exc:  # pragma: no cover
-                LOGGER.warning("Failed to read page %s in %s: %s", index, path, exc)
+            text, error = _safe_extract(doc, index)
+            if error is not None:
+                errors.append(error)
+            elif text:
+                yield index + 1, text + "\n"
+    finally:
+        if errors:
+            LOGGER.warning(
+                "Failed to read %d page(s) in %s: %s", len(errors), path, "; ".join(errors[:3])
+            )
+
+
+def _pdf_metadata(doc, path: Path) -> Dict[str, str]:
+    """Return title and page count of an already open PDF."""
+    metadata = doc.metadata or {}
+    title = metadata.get("title") or path.stem
+    return {"title": title, "page_count": str(len(doc))}
+
+
+def iter_text_parts(path: Path) -> Iterator[str]:
+    """Yield text content from a PDF file, page by page."""
+    doc = _open_pdf(path)
+    if doc is None:
+        return
+    try:
+        for _, text in _iter_pdf_pages(doc, path):
+            yield text
     finally:
         doc.close()
 
@@ -121,9 +161,7 @@ def get_pdf_metadata(path: Path) -> Dict[str, str]:
     """Extract title and page count from a PDF."""
     doc = fitz.open(path)
     try:
-        metadata = doc.metadata or {}
-        title = metadata.get("title") or path.stem
-        return {"title": title, "page_count": str(len(doc))}
+        return _pdf_metadata(doc, path)
     finally:
         doc.close()
 
@@ -305,36 +343,17 @@ def _iter_text_by_suffix(path: Path) -> Iterator[str]:
         LOGGER.warning("Unsupported file type: %s", path.suffix)
 
 
-def _get_title(path: Path) -> str:
-    if path.suffix.lower() == ".pdf":
-        try:
-            return get_pdf_metadata(path).get("title", path.stem)
-        except Exception:
-            pass
-    return path.stem
-
-
 def iter_text_parts_paged(path: Path) -> Iterator[tuple[int, str]]:
     """Yield ``(page_number, text)`` for PDF files (1-based page numbers).
 
     Uses PyMuPDF to extract text page by page.  Tables are detected
     automatically and rendered as Markdown to preserve structure.
     """
-    try:
-        doc = fitz.open(path)
-    except Exception as exc:
-        LOGGER.error("Failed to open PDF %s: %s", path, exc)
+    doc = _open_pdf(path)
+    if doc is None:
         return
     try:
-        for index in range(len(doc)):
-            try:
-                page = doc[index]
-                text = _extract_page_text(page)
-                normalized = normalize_whitespace([text])
-                if normalized:
-                    yield index + 1, normalized + "\n"
-            except Exception as exc:  # pragma: no cover
-                LOGGER.warning("Failed to read page %s in %s: %s", index, path, exc)
+        yield from _iter_pdf_pages(doc, path)
     finally:
         doc.close()
 
@@ -360,12 +379,82 @@ def _iter_paged_text(path: Path) -> Iterator[tuple[int, str]]:
         LOGGER.warning("Unsupported file type: %s", path.suffix)
 
 
-def build_chunks(path: Path, *, max_chars: int = 1200, overlap: int = 200) -> Iterable[ChunkRecord]:
-    """Produce overlapping chunk records for any supported document type."""
+# ── Chunk sizing ──────────────────────────────────────────────────────────────
+
+# Page-count driven chunk sizes, used when build_chunks() is called without
+# explicit sizes: (max_pages, max_chars, overlap).  Short documents get larger
+# chunks so they are not sprayed into tiny fragments; long documents get
+# smaller ones for finer-grained retrieval.  ``None`` matches any page count.
+_CHUNK_RULES: list[tuple[int | None, int, int]] = [
+    (10, 1500, 150),
+    (50, 1000, 200),
+    (200, 800, 160),
+    (None, 600, 120),
+]
+
+# Used when the page count is unknown (non-PDF formats, unreadable metadata).
+_DEFAULT_CHUNK_PARAMS: tuple[int, int] = (1200, 200)
+
+
+def _chunk_params_for(page_count: int | None) -> tuple[int, int]:
+    """Return ``(max_chars, overlap)`` for a document with *page_count* pages."""
+    if page_count is None:
+        return _DEFAULT_CHUNK_PARAMS
+    for max_pages, max_chars, overlap in _CHUNK_RULES:
+        if max_pages is None or page_count <= max_pages:
+            break
+    return max_chars, overlap
+
+
+def build_chunks(
+    path: Path, *, max_chars: int | None = None, overlap: int | None = None
+) -> Iterable[ChunkRecord]:
+    """Produce overlapping chunk records for any supported document type.
+
+    When *max_chars* or *overlap* is omitted, it is chosen from
+    ``_CHUNK_RULES`` based on the document's page count.  PDFs are opened
+    once and shared between metadata and text extraction.
+    """
+    if path.suffix.lower() != ".pdf":
+        metadata = {"title": path.stem}
+        yield from _chunk_pages(path, metadata, _iter_paged_text(path), max_chars, overlap)
+        return
+
+    doc = _open_pdf(path)
+    if doc is None:
+        return
+    try:
+        try:
+            metadata = _pdf_metadata(doc, path)
+        except Exception:
+            metadata = {"title": path.stem}
+        yield from _chunk_pages(path, metadata, _iter_pdf_pages(doc, path), max_chars, overlap)
+    finally:
+        doc.close()
+
+
+def _chunk_pages(
+    path: Path,
+    metadata: Dict[str, str],
+    pages: Iterable[tuple[int, str]],
+    max_chars: int | None,
+    overlap: int | None,
+) -> Iterator[ChunkRecord]:
     from docfinder.utils.text import chunk_text_stream_paged
 
-    title = _get_title(path)
-    pages = _iter_paged_text(path)
+    title = metadata["title"]
+
+    if max_chars is None or overlap is None:
+        page_count = metadata.get("page_count", "")
+        rule_chars, rule_overlap = _chunk_params_for(
+            int(page_count) if page_count.isdigit() else None
+        )
+        if max_chars is None:
+            max_chars = rule_chars
+        if overlap is None:
+            # Keep the rule's overlap ratio so a user-chosen size never gets
+            # an overlap meant for much larger chunks.
+            overlap = max_chars * rule_overlap // rule_chars
 
     for idx, (chunk, page_num) in enumerate(
         chunk_text_stream_paged(pages, max_chars=max_chars, overlap=overlap)
@@ -376,3 +465,44 @@ def build_chunks(path: Path, *, max_chars: int = 1200, overlap: int = 200) -> It
             text=chunk,
             metadata={"title": title, "page": page_num},
         )
+
+
+def _build_chunks_list(args: tuple) -> tuple[str, list[ChunkRecord]]:
+    """Build all chunks for one document (runs in a worker process).
+
+    Top-level so it can be pickled by multiprocessing.
+    """
+    path_str, max_chars, overlap = args
+    path = Path(path_str)
+    try:
+        return path_str, list(build_chunks(path, max_chars=max_chars, overlap=overlap))
+    except Exception as exc:
+        LOGGER.error("Failed to build chunks for %s: %s", path, exc)
+        return path_str, []
+
+
+def build_chunks_many(
+    paths: Iterable[Path],
+    *,
+    workers: int | None = None,
+    max_chars: int | None = None,
+    overlap: int | None = None,
+) -> Iterator[tuple[Path, list[ChunkRecord]]]:
+    """Yield ``(path, chunks)`` for many documents, parsing them in parallel.
+
+    Results arrive in input order as soon as each document is parsed, so the
+    caller can embed early documents while workers are still busy with later
+    ones.  Documents that cannot be read yield an empty chunk list.
+    """
+    args = [(str(path), max_chars, overlap) for path in paths]
+    workers = min(workers or os.cpu_count() or 1, len(args))
+
+    if workers <= 1:
+        for item in args:
+            path_str, chunks = _build_chunks_list(item)
+            yield Path(path_str), chunks
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path_str, chunks in executor.map(_build_chunks_list, args):
+            yield Path(path_str), chunks
@@ -3,21 +3,42 @@
 from __future__ import annotations
 
 import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, Iterator
 
 SUPPORTED_EXTENSIONS: frozenset[str] = frozenset({".pdf", ".txt", ".md", ".docx"})
+_PDF_EXTENSIONS: frozenset[str] = frozenset({".pdf"})
+
+
+def _walk(root: Path, suffixes: frozenset[str]) -> Iterator[Path]:
+    """Yield files under *root* whose lower-cased suffix is in *suffixes*.
+
+    Uses ``os.scandir`` so file type and name checks come from the directory
+    listing itself; only matching entries become ``Path`` objects. Like
+    ``Path.rglob``, symlinked directories are not followed and unreadable
+    directories are skipped.
+    """
+    pending = deque([os.fspath(root)])
+    while pending:
+        try:
+            with os.scandir(pending.popleft()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            continue
 
 
 def iter_document_paths(inputs: Iterable[Path]) -> Iterator[Path]:
     """Yield supported document paths from input paths, descending into directories."""
     for item in inputs:
         if item.is_dir():
-            yield from sorted(
-                p
-                for p in item.rglob("*")
-                if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS
-            )
+            yield from sorted(_walk(item, SUPPORTED_EXTENSIONS))
         elif item.is_file() and item.suffix.lower() in SUPPORTED_EXTENSIONS:
             yield item
 
@@ -26,15 +47,35 @@ def iter_pdf_paths(inputs: Iterable[Path]) -> Iterator[Path]:
     """Yield PDF paths from input paths (kept for backward compatibility)."""
     for item in inputs:
         if item.is_dir():
-            yield from sorted(p for p in item.rglob("*.pdf") if p.is_file())
+            yield from sorted(_walk(item, _PDF_EXTENSIONS))
         elif item.is_file() and item.suffix.lower() == ".pdf":
             yield item
 
 
 def compute_sha256(path: Path) -> str:
     """Compute SHA256 hash for a file."""
-    sha = hashlib.sha256()
     with path.open("rb") as handle:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            # Hashes into a reused buffer inside C, without per-chunk bytes objects
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        sha = hashlib.sha256()
         for chunk in iter(lambda: handle.read(1 << 20), b""):
             sha.update(chunk)
-    return sha.hexdigest()
+        return sha.hexdigest()
+
+
+def compute_sha256_many(
+    paths: Iterable[Path], *, max_workers: int | None = None
+) -> dict[Path, str]:
+    """Compute SHA256 hashes for several files concurrently.
+
+    hashlib releases the GIL while hashing and file reads release it too, so
+    threads overlap disk I/O and hashing across files. Errors from individual
+    files propagate, as with ``compute_sha256``.
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {path: compute_sha256(path) for path in paths}
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(compute_sha256, paths)))
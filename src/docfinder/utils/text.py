@@ -14,19 +14,28 @@ _SENTENCE_END = re.compile(
 )
 
 
+# Fallback break points for "sentences" longer than a whole chunk (tables,
+# lists, text without punctuation): clause punctuation first, then whitespace.
+_CLAUSE_END = re.compile(r"[.!?;:]\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
 def _split_sentences(text: str) -> list[str]:
     """Split *text* into sentence-like segments.
 
-    Uses regex to split at sentence boundaries while keeping
-    the text intact (no characters are lost).
+    Segments are sliced at the end of each boundary match, so the separating
+    whitespace stays attached to the preceding sentence and joining the
+    segments reproduces the text (no characters are lost).
     """
     if not text:
         return []
 
-    parts = _SENTENCE_END.split(text)
     # Merge very short fragments (< 20 chars) back into previous sentence
     merged: list[str] = []
-    for part in parts:
+    start = 0
+    for end in [m.end() for m in _SENTENCE_END.finditer(text)] + [len(text)]:
+        part = text[start:end]
+        start = end
         if merged and len(merged[-1]) < 20:
             merged[-1] += part
         else:
@@ -34,15 +43,59 @@ def _split_sentences(text: str) -> list[str]:
     return [s for s in merged if s.strip()]
 
 
+def _split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+    """Break *sentence* into pieces of at most *max_chars* characters.
+
+    Cuts at the last clause boundary (or whitespace) within the final 20%
+    of each slice, falling back to a hard cut when neither is present.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces: list[str] = []
+    start = 0
+    while len(sentence) - start > max_chars:
+        end = start + max_chars
+        window_start = max(start + 1, end - max_chars // 5)
+        cut = end
+        for pattern in (_CLAUSE_END, _WHITESPACE):
+            last = None
+            for last in pattern.finditer(sentence, window_start, end):
+                pass
+            if last is not None:
+                cut = last.end()
+                break
+        pieces.append(sentence[start:cut])
+        start = cut
+    pieces.append(sentence[start:])
+    return [p for p in pieces if p]
+
+
+def _overlap_tail(sentence: str, overlap: int) -> str:
+    """Return at most *overlap* trailing characters of *sentence*, starting at a word."""
+    start = len(sentence) - overlap
+    if start <= 0:
+        return sentence
+    if not sentence[start - 1].isspace():
+        space = _WHITESPACE.search(sentence, start)
+        if space is not None and space.end() < len(sentence):
+            start = space.end()
+    return sentence[start:]
+
+
 def chunk_text(text: str, *, max_chars: int = 1200, overlap: int = 200) -> Iterator[str]:
     """Split text into overlapping character chunks.
 
     This coarse chunker keeps things simple while preserving context overlap.
+    Raises ``ValueError`` if *overlap* is not smaller than *max_chars*.
     """
-    if not text:
-        return iter(())
+    step = max_chars - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than max_chars")
 
-    step = max(max_chars - overlap, 1)
+    # One C-level slice per chunk; the work is already proportional to the
+    # number of chunks, not characters, so there is no per-character loop
+    # left to compile.
     for start in range(0, len(text), step):
         yield text[start : start + max_chars]
 
@@ -53,21 +106,30 @@ def chunk_text_stream(
     """Split a stream of text parts into overlapping character chunks.
 
     Buffers incoming text just enough to produce chunks of `max_chars`.
+    Chunks are sliced at a moving offset; the consumed prefix is dropped
+    only when the next part arrives, so each chunk costs one slice rather
+    than a copy of the whole remaining buffer.
+    Raises ``ValueError`` if *overlap* is not smaller than *max_chars*.
     """
+    step = max_chars - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than max_chars")
+
     buffer = ""
-    step = max(max_chars - overlap, 1)
+    pos = 0
 
     for part in text_stream:
-        buffer += part
-        while len(buffer) >= max_chars:
-            yield buffer[:max_chars]
-            buffer = buffer[step:]
+        buffer = buffer[pos:] + part
+        pos = 0
+        while len(buffer) - pos >= max_chars:
+            yield buffer[pos : pos + max_chars]
+            pos += step
 
     # Process remaining buffer
-    if buffer:
+    if pos < len(buffer):
         # If buffer is smaller than max_chars but we have content, yield it
         # Note: standard chunk_text yields the last part even if short
-        yield buffer
+        yield buffer[pos:]
 
 
 def chunk_text_stream_paged(
@@ -79,12 +141,19 @@ def chunk_text_stream_paged(
     that contributed the **start** of the chunk.
 
     Algorithm:
-    1. Incoming text is split into sentences.
+    1. Incoming text is split into sentences; a sentence longer than
+       *max_chars* is broken at clause or word boundaries.
     2. Sentences accumulate until adding the next one would exceed *max_chars*.
     3. When a chunk is emitted, the last sentence(s) of the previous chunk
-       are kept as semantic overlap (up to *overlap* characters worth).
+       are kept as semantic overlap (up to *overlap* characters worth); if
+       the last sentence alone is longer, its final words are kept instead.
     4. Paragraph breaks (``\\n\\n``) are preferred split points.
+
+    Raises ``ValueError`` if *overlap* is not smaller than *max_chars*.
     """
+    if overlap >= max_chars:
+        raise ValueError("overlap must be smaller than max_chars")
+
     # Accumulated sentences for the current chunk
     sentences: list[str] = []
     # Page number for the start of the current chunk
@@ -96,7 +165,11 @@ def chunk_text_stream_paged(
         if not sentences:
             chunk_page = page_num
 
-        page_sentences = _split_sentences(part)
+        page_sentences = [
+            piece
+            for sentence in _split_sentences(part)
+            for piece in _split_long_sentence(sentence, max_chars)
+        ]
 
         for sentence in page_sentences:
             sent_len = len(sentence)
@@ -110,10 +183,15 @@ def chunk_text_stream_paged(
                 overlap_sents: list[str] = []
                 overlap_len = 0
                 for s in reversed(sentences):
-                    if overlap_len + len(s) > overlap and overlap_sents:
+                    if overlap_len + len(s) > overlap:
                         break
                     overlap_sents.insert(0, s)
                     overlap_len += len(s)
+                # A final sentence longer than the budget still leaves a
+                # trimmed tail, so consecutive chunks always share context.
+                if not overlap_sents and overlap > 0:
+                    overlap_sents = [_overlap_tail(sentences[-1], overlap)]
+                    overlap_len = len(overlap_sents[0])
 
                 sentences = overlap_sents
                 chunk_len = overlap_len
@@ -129,4 +207,5 @@ def chunk_text_stream_paged(
 
 def normalize_whitespace(lines: Iterable[str]) -> str:
     """Collapse whitespace and join lines."""
-    return "\n".join(line.strip() for line in lines if line.strip())
+    # Strip each line once; ``filter(None, ...)`` drops the now-empty ones
+    return "\n".join(filter(None, (line.strip() for line in lines)))
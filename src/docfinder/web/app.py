@@ -9,6 +9,7 @@ import subprocess
 import sys
 import threading
 import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, List
@@ -26,7 +27,7 @@ from docfinder.embedding.encoder import (
 from docfinder.index.indexer import Indexer
 from docfinder.index.reranker import Reranker
 from docfinder.index.search import Searcher, SearchResult
-from docfinder.index.storage import SQLiteVectorStore
+from docfinder.index.storage import SQLiteVectorStore, decode_metadata
 from docfinder.settings import load_settings
 from docfinder.settings import save_settings as _save_settings
 from docfinder.web.frontend import router as frontend_router
@@ -64,6 +65,41 @@ def _get_reranker() -> Reranker:
     return _reranker
 
 
+# ── Shared database stores ────────────────────────────────────────────────────
+# The most recently used databases keep one extra reference until shutdown or
+# eviction, so the shared connection from ``SQLiteVectorStore.open`` (and its
+# cached search matrix) survives between requests. The cap bounds how many
+# connections and matrices client-supplied ``db`` paths can keep in memory.
+_PINNED_STORES_MAX = 4
+_pinned_stores: OrderedDict[tuple[str, int], SQLiteVectorStore] = OrderedDict()
+_pinned_stores_lock = threading.Lock()
+
+
+def _open_store(db_path: Path) -> SQLiteVectorStore:
+    """Return the process-wide store for *db_path*; pair each call with ``close()``."""
+    dimension = _get_embedder().dimension
+    key = (os.path.realpath(db_path), dimension)
+    with _pinned_stores_lock:
+        if key in _pinned_stores:
+            _pinned_stores.move_to_end(key)
+        else:
+            _pinned_stores[key] = SQLiteVectorStore.open(db_path, dimension=dimension)
+            if len(_pinned_stores) > _PINNED_STORES_MAX:
+                # Requests still holding the evicted store keep it open until
+                # they close it; only the pin is dropped here.
+                _, evicted = _pinned_stores.popitem(last=False)
+                evicted.close()
+        return SQLiteVectorStore.open(db_path, dimension=dimension)
+
+
+def _close_stores() -> None:
+    """Release the references held by ``_open_store``."""
+    with _pinned_stores_lock:
+        for store in _pinned_stores.values():
+            store.close()
+        _pinned_stores.clear()
+
+
 # ── Async indexing job registry ───────────────────────────────────────────────
 _index_jobs: dict[str, dict] = {}
 
@@ -114,6 +150,7 @@ async def lifespan(app: FastAPI):
     await asyncio.to_thread(_get_embedder)
     await asyncio.to_thread(_preload_reranker)
     yield
+    _close_stores()
 
 
 app = FastAPI(title="DocFinder Web", version="2.0.0", lifespan=lifespan)
@@ -192,11 +229,13 @@ async def search_documents(payload: SearchPayload) -> dict[str, List[SearchResul
 
     embedder = _get_embedder()
     reranker = _get_reranker()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
-    searcher = Searcher(embedder, store, reranker=reranker)
-    folders = [f.strip() for f in payload.folders if f and f.strip()]
-    results = searcher.search(query, top_k=top_k, folders=folders if folders else None)
-    store.close()
+    store = _open_store(resolved_db)
+    try:
+        searcher = Searcher(embedder, store, reranker=reranker)
+        folders = [f.strip() for f in payload.folders if f and f.strip()]
+        results = searcher.search(query, top_k=top_k, folders=folders if folders else None)
+    finally:
+        store.close()
     return {"results": results}
 
 
@@ -207,8 +246,7 @@ async def search_folders(db: Path | None = None) -> dict[str, Any]:
     if not resolved_db.exists():
         return {"folders": []}
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
     try:
         folders = store.list_indexed_directories()
     finally:
@@ -376,8 +414,7 @@ async def rag_chat(payload: RAGPayload) -> dict:
     if not resolved_db.exists():
         raise HTTPException(status_code=404, detail="Database not found")
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
 
     try:
         # Look up document_id
@@ -389,8 +426,6 @@ async def rag_chat(payload: RAGPayload) -> dict:
         doc_id = row["id"]
 
         # Get context: try page-based first, fall back to fixed window
-        import json as _json
-
         max_chars = 4000 * 4  # ~4000 tokens
 
         # Find the page of the clicked chunk
@@ -398,9 +433,7 @@ async def rag_chat(payload: RAGPayload) -> dict:
             "SELECT metadata FROM chunks WHERE document_id = ? AND chunk_index = ?",
             (doc_id, payload.chunk_index),
         ).fetchone()
-        chunk_meta = (
-            _json.loads(chunk_row["metadata"]) if chunk_row and chunk_row["metadata"] else {}
-        )
+        chunk_meta = decode_metadata(chunk_row["metadata"]) if chunk_row else {}
         center_page = chunk_meta.get("page") if chunk_row else None
 
         if center_page is not None:
@@ -485,8 +518,7 @@ async def list_documents(db: Path | None = None) -> dict[str, Any]:
             "stats": {"document_count": 0, "chunk_count": 0, "total_size_bytes": 0},
         }
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
     try:
         documents = store.list_documents()
         stats = store.get_stats()
@@ -503,8 +535,7 @@ async def cleanup_missing_files(db: Path | None = None) -> dict[str, Any]:
     if not resolved_db.exists():
         raise HTTPException(status_code=404, detail="Database not found")
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
     try:
         removed_count = store.remove_missing_files()
     finally:
@@ -520,8 +551,7 @@ async def delete_document_by_id(doc_id: int, db: Path | None = None) -> dict[str
     if not resolved_db.exists():
         raise HTTPException(status_code=404, detail="Database not found")
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
     try:
         deleted = store.delete_document(doc_id)
     finally:
@@ -543,8 +573,7 @@ async def delete_document(payload: DeleteDocumentRequest, db: Path | None = None
     if not resolved_db.exists():
         raise HTTPException(status_code=404, detail="Database not found")
 
-    embedder = _get_embedder()
-    store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
+    store = _open_store(resolved_db)
     try:
         if payload.doc_id is not None:
             deleted = store.delete_document(payload.doc_id)
@@ -609,6 +638,8 @@ def _run_index_job(
             job["total"] = total
             job["current_file"] = current_file
 
+    # A private connection: the long ingest transaction stays off the shared
+    # store's lock, and readers pick up its commits through PRAGMA data_version.
     store = SQLiteVectorStore(resolved_db, dimension=embedder.dimension)
     # No fixed embed_batch_size — Indexer adapts per-file based on available RAM
     indexer = Indexer(
@@ -647,10 +678,18 @@ def _get_runtime_info() -> dict[str, Any]:
     return info
 
 
+def _allowed_root() -> Path:
+    """Return the directory that indexed paths must live under.
+
+    Defaults to the user's home; ``DOCFINDER_ALLOWED_ROOT`` overrides it.
+    """
+    return Path(os.path.realpath(os.environ.get("DOCFINDER_ALLOWED_ROOT") or str(Path.home())))
+
+
 def _validate_paths(paths: List[str]) -> List[Path]:
     """Validate and resolve a list of raw path strings. Raises HTTPException on error."""
     logger = logging.getLogger(__name__)
-    safe_base_dir = Path(os.path.realpath(str(Path.home())))
+    safe_base_dir = _allowed_root()
     resolved_paths: List[Path] = []
 
     for p in paths:
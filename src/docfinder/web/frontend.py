@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from importlib.resources import files
 
 from fastapi import APIRouter
@@ -10,7 +11,9 @@ from fastapi.responses import HTMLResponse
 router = APIRouter()
 
 
+@lru_cache(maxsize=None)
 def _load_template(name: str) -> str:
+    """Read a packaged template once; the files don't change while the app runs."""
     template = files("docfinder.web").joinpath("templates", name)
     return template.read_text(encoding="utf-8")
 
@@ -4,8 +4,120 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One ``TestClient`` for the web app, shared by every test in the session.
+
+    The client is not entered as a context manager: that would run the app
+    lifespan, which pre-loads the real embedding and reranker models.
+    """
+    from fastapi.testclient import TestClient
+
+    from docfinder.web.app import app
+
+    test_client = TestClient(app)
+    yield test_client
+    test_client.close()
+
+
+@pytest.fixture(scope="session")
+def embedder_mock():
+    """One ``EmbeddingModel`` mock (768 dimensions) shared across the session.
+
+    Tests patch the class with a factory returning it; callers that record
+    calls on it should reset it between tests.
+    """
+    from docfinder.embedding.encoder import EmbeddingModel
+
+    mock = MagicMock(spec=EmbeddingModel)
+    mock.dimension = 768
+    return mock
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    """Run ``@pytest.mark.anyio`` tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture
+async def aclient():
+    """An ``httpx.AsyncClient`` that calls the web app in-process on the test's loop.
+
+    Unlike ``TestClient`` there is no portal thread per request. The app
+    lifespan is not run, so no real models are loaded.
+    """
+    from httpx import ASGITransport, AsyncClient
+
+    from docfinder.web.app import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def index_html(client):
+    """The ``GET /`` response, fetched once and shared by frontend tests."""
+    return client.get("/")
+
+
+@pytest.fixture(scope="session")
+def dummy_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """An empty file that satisfies the web app's "database exists" checks.
+
+    Its contents are never read: tests using it mock the store.
+    """
+    path = tmp_path_factory.mktemp("dbs") / "test.db"
+    path.touch()
+    return path
+
+
+@pytest.fixture(scope="session")
+def mock_specs(embedder_mock: MagicMock) -> SimpleNamespace:
+    """Stand-ins for the web app's embedder, store and searcher, built once per session.
+
+    The embedder is the shared ``embedder_mock``. The store and searcher are
+    autospecced: ``create_autospec`` walks each class once here and
+    ``mock_stack`` resets the mocks between tests instead of rebuilding them.
+    """
+    from docfinder.index.search import Searcher
+    from docfinder.index.storage import SQLiteVectorStore
+
+    return SimpleNamespace(
+        embedder=embedder_mock,
+        store=create_autospec(SQLiteVectorStore, instance=True),
+        searcher=create_autospec(Searcher, instance=True),
+    )
+
+
+@pytest.fixture
+def mock_stack(monkeypatch: pytest.MonkeyPatch, mock_specs: SimpleNamespace) -> SimpleNamespace:
+    """Replace the web app's embedder, store and searcher with the shared stand-ins.
+
+    The classes are patched on ``docfinder.web.app`` with factories returning
+    the instances exposed here, so tests only configure return values. The
+    cached embedder singleton is cleared so this test's stand-in is the one used.
+    """
+    from docfinder.web import app as web_app
+
+    mock_specs.embedder.reset_mock()
+    mock_specs.store.reset_mock(return_value=True, side_effect=True)
+    mock_specs.searcher.reset_mock(return_value=True, side_effect=True)
+
+    monkeypatch.setattr(web_app, "_embedder", None)
+    monkeypatch.setattr(web_app, "EmbeddingModel", lambda *a, **k: mock_specs.embedder)
+    monkeypatch.setattr(web_app, "SQLiteVectorStore", lambda *a, **k: mock_specs.store)
+    monkeypatch.setattr(web_app, "_open_store", lambda *a, **k: mock_specs.store)
+    monkeypatch.setattr(web_app, "Searcher", lambda *a, **k: mock_specs.searcher)
+    return mock_specs
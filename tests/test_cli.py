@@ -6,6 +6,7 @@ import logging
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
 from docfinder.cli import _ensure_db_parent, _setup_logging, app
@@ -13,6 +14,12 @@ from docfinder.cli import _ensure_db_parent, _setup_logging, app
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def _reset_embedder_mock(embedder_mock: MagicMock) -> None:
+    """Clear calls recorded on the shared embedder mock by earlier tests."""
+    embedder_mock.reset_mock()
+
+
 class TestSetupLogging:
     """Tests for _setup_logging helper."""
 
@@ -61,15 +68,15 @@ class TestIndexCommand:
         assert result.exit_code == 0
         assert "No supported documents found" in result.stdout
 
-    @patch("docfinder.cli.EmbeddingModel")
     @patch("docfinder.cli.SQLiteVectorStore")
     @patch("docfinder.cli.Indexer")
     def test_index_with_pdfs(
         self,
         mock_indexer_class: MagicMock,
         mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
         tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Successfully indexes PDFs."""
         # Create a fake PDF file
@@ -81,9 +88,7 @@ class TestIndexCommand:
         db_path = tmp_path / "test.db"
 
         # Setup mocks
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
 
         mock_store = MagicMock()
         mock_store_class.return_value = mock_store
@@ -101,15 +106,50 @@ class TestIndexCommand:
         assert result.exit_code == 0
         assert "Inserted: 1" in result.stdout
 
-    @patch("docfinder.cli.EmbeddingModel")
+    @pytest.mark.parametrize(("document_count", "bulk"), [(0, True), (3, False)])
+    @patch("docfinder.cli.SQLiteVectorStore")
+    @patch("docfinder.cli.Indexer")
+    def test_index_bulk_loads_fresh_database(
+        self,
+        mock_indexer_class: MagicMock,
+        mock_store_class: MagicMock,
+        document_count: int,
+        bulk: bool,
+        tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Only an empty database is filled inside bulk_context."""
+        pdf_dir = tmp_path / "pdfs"
+        pdf_dir.mkdir()
+        (pdf_dir / "test.pdf").write_bytes(b"%PDF-1.4 fake pdf")
+
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
+
+        mock_store = MagicMock()
+        mock_store.get_stats.return_value = {"document_count": document_count}
+        mock_store_class.return_value = mock_store
+
+        mock_indexer = MagicMock()
+        mock_indexer.index.return_value = MagicMock(inserted=1, updated=0, skipped=0, failed=0)
+        mock_indexer_class.return_value = mock_indexer
+
+        result = runner.invoke(app, ["index", str(pdf_dir), "--db", str(tmp_path / "test.db")])
+        assert result.exit_code == 0
+        assert "Inserted: 1" in result.stdout
+        mock_indexer.index.assert_called_once()
+        assert mock_store.bulk_context.called is bulk
+        assert mock_store.bulk_context.return_value.__exit__.called is bulk
+
     @patch("docfinder.cli.SQLiteVectorStore")
     @patch("docfinder.cli.Indexer")
     def test_index_verbose(
         self,
         mock_indexer_class: MagicMock,
         mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
         tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Verbose flag is accepted."""
         pdf_dir = tmp_path / "pdfs"
@@ -119,9 +159,7 @@ class TestIndexCommand:
 
         db_path = tmp_path / "test.db"
 
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
 
         mock_store = MagicMock()
         mock_store_class.return_value = mock_store
@@ -153,23 +191,21 @@ class TestSearchCommand:
             output += repr(result.exception)
         assert "Database not found" in output or result.exit_code == 2
 
-    @patch("docfinder.cli.EmbeddingModel")
     @patch("docfinder.cli.SQLiteVectorStore")
     @patch("docfinder.cli.Searcher")
     def test_search_no_results(
         self,
         mock_searcher_class: MagicMock,
         mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
         tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Shows message when no results found."""
         db_path = tmp_path / "test.db"
         db_path.touch()
 
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
 
         mock_store = MagicMock()
         mock_store_class.return_value = mock_store
@@ -182,23 +218,21 @@ class TestSearchCommand:
         assert result.exit_code == 0
         assert "No matches found" in result.stdout
 
-    @patch("docfinder.cli.EmbeddingModel")
     @patch("docfinder.cli.SQLiteVectorStore")
     @patch("docfinder.cli.Searcher")
     def test_search_with_results(
         self,
         mock_searcher_class: MagicMock,
         mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
         tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Displays results in a table."""
         db_path = tmp_path / "test.db"
         db_path.touch()
 
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
 
         mock_store = MagicMock()
         mock_store_class.return_value = mock_store
@@ -228,21 +262,19 @@ class TestPruneCommand:
         assert result.exit_code == 0
         assert "Database not found" in result.stdout
 
-    @patch("docfinder.cli.EmbeddingModel")
     @patch("docfinder.cli.SQLiteVectorStore")
     def test_prune_success(
         self,
         mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
         tmp_path: Path,
+        embedder_mock: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Successfully prunes orphaned documents."""
         db_path = tmp_path / "test.db"
         db_path.touch()
 
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        monkeypatch.setattr("docfinder.cli.EmbeddingModel", lambda *a, **k: embedder_mock)
 
         mock_store = MagicMock()
         mock_store.remove_missing_files.return_value = 3
@@ -128,8 +128,23 @@ class TestIndexer:
         """Test default chunk parameters."""
         indexer = Indexer(mock_embedder, mock_store)
 
-        assert indexer.chunk_chars == 1200
-        assert indexer.overlap == 200
+        assert indexer.chunk_chars is None
+        assert indexer.overlap is None
+
+    @patch("docfinder.index.indexer.build_chunks")
+    @patch("docfinder.index.indexer.compute_sha256")
+    def test_default_params_defer_to_loader(
+        self, mock_sha256, mock_build_chunks, mock_embedder, mock_store, tmp_path
+    ):
+        """Unset chunk sizes should reach build_chunks as None (page-count rules)."""
+        pdf_path = tmp_path / "test.pdf"
+        pdf_path.write_text("test")
+        mock_build_chunks.return_value = iter([])
+        mock_sha256.return_value = "abc123"
+
+        Indexer(mock_embedder, mock_store).index([pdf_path])
+
+        mock_build_chunks.assert_called_once_with(pdf_path, max_chars=None, overlap=None)
 
     @patch("docfinder.index.indexer.iter_document_paths")
     @patch("docfinder.index.indexer.build_chunks")
@@ -219,6 +234,27 @@ class TestIndexer:
         indexer.embedder.embed.assert_not_called()
         indexer.store.insert_chunks.assert_not_called()
 
+    @patch("docfinder.index.indexer.iter_document_paths")
+    @patch("docfinder.index.indexer.build_chunks")
+    @patch("docfinder.index.indexer.compute_sha256")
+    def test_index_unchanged_stat_skips_parse_and_hash(
+        self, mock_sha256, mock_build_chunks, mock_iter_pdfs, indexer, tmp_path
+    ):
+        """A file whose stored mtime and size match is skipped without reading it."""
+        pdf_path = tmp_path / "test.pdf"
+        pdf_path.write_text("test")
+        stat = pdf_path.stat()
+
+        mock_iter_pdfs.return_value = [pdf_path]
+        indexer.store.get_document_stat.return_value = (stat.st_mtime, stat.st_size)
+
+        stats = indexer.index([pdf_path])
+
+        assert stats.skipped == 1
+        mock_build_chunks.assert_not_called()
+        mock_sha256.assert_not_called()
+        indexer.store.init_document.assert_not_called()
+
     @patch("docfinder.index.indexer.iter_document_paths")
     @patch("docfinder.index.indexer.build_chunks")
     def test_index_empty_document(self, mock_build_chunks, mock_iter_pdfs, indexer, tmp_path):
@@ -104,8 +104,8 @@ class TestIterTextParts:
         assert len(parts) == 2
         assert "Page 1" in parts[0]
         assert "Page 3" in parts[1]
-        # Should have logged warning
-        assert mock_logger.warning.called
+        # Should have logged a single summary warning
+        mock_logger.warning.assert_called_once()
 
     @patch("docfinder.ingestion.pdf_loader.fitz")
     @patch("docfinder.ingestion.pdf_loader.LOGGER")
@@ -179,17 +179,31 @@ class TestGetPdfMetadata:
         assert metadata["page_count"] == "5"
 
 
+def _mock_pdf_doc(page_texts: list[str], *, title: str | None = None) -> MagicMock:
+    """Build a PyMuPDF document mock with one page per entry in *page_texts*."""
+    pages = []
+    for text in page_texts:
+        page = MagicMock()
+        page.get_text.return_value = text
+        page.find_tables.return_value = MagicMock(tables=[])
+        pages.append(page)
+
+    doc = MagicMock()
+    doc.metadata = {"title": title} if title is not None else {}
+    doc.__len__ = MagicMock(return_value=len(pages))
+    doc.__getitem__ = MagicMock(side_effect=lambda i: pages[i])
+    return doc
+
+
 class TestBuildChunks:
     """Test build_chunks function."""
 
-    @patch("docfinder.ingestion.pdf_loader.iter_text_parts_paged")
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_build_chunks_simple(
-        self, mock_meta: MagicMock, mock_iter: MagicMock, tmp_path: Path
-    ) -> None:
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_simple(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
         """Should build chunks from PDF text."""
-        mock_meta.return_value = {"title": "Test", "page_count": "1"}
-        mock_iter.return_value = iter([(1, "This is a test document with some content.")])
+        mock_fitz.open.return_value = _mock_pdf_doc(
+            ["This is a test document with some content."], title="Test"
+        )
 
         pdf_path = tmp_path / "test.pdf"
         pdf_path.write_bytes(b"dummy")
@@ -202,16 +216,12 @@ class TestBuildChunks:
         assert chunks[0].index == 0
         assert chunks[0].metadata["title"] == "Test"
 
-    @patch("docfinder.ingestion.pdf_loader.iter_text_parts_paged")
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_build_chunks_multiple(
-        self, mock_meta: MagicMock, mock_iter: MagicMock, tmp_path: Path
-    ) -> None:
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_multiple(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
         """Should create multiple chunks for long text."""
         # Use text with sentence boundaries so the sentence-aware chunker can split it
         long_text = " ".join(f"Sentence number {i} is here." for i in range(50))
-        mock_meta.return_value = {"title": "Long", "page_count": "1"}
-        mock_iter.return_value = iter([(1, long_text)])
+        mock_fitz.open.return_value = _mock_pdf_doc([long_text], title="Long")
 
         pdf_path = tmp_path / "long.pdf"
         pdf_path.write_bytes(b"dummy")
@@ -224,14 +234,10 @@ class TestBuildChunks:
         for i, chunk in enumerate(chunks):
             assert chunk.index == i
 
-    @patch("docfinder.ingestion.pdf_loader.iter_text_parts_paged")
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_build_chunks_metadata(
-        self, mock_meta: MagicMock, mock_iter: MagicMock, tmp_path: Path
-    ) -> None:
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_metadata(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
         """Should include metadata in chunks."""
-        mock_meta.return_value = {"title": "My Document", "page_count": "5"}
-        mock_iter.return_value = iter([(1, "Content")])
+        mock_fitz.open.return_value = _mock_pdf_doc(["Content"] * 5, title="My Document")
 
         pdf_path = tmp_path / "doc.pdf"
         pdf_path.write_bytes(b"dummy")
@@ -242,14 +248,10 @@ class TestBuildChunks:
         chunk = chunks[0]
         assert chunk.metadata["title"] == "My Document"
 
-    @patch("docfinder.ingestion.pdf_loader.iter_text_parts_paged")
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_build_chunks_empty_text(
-        self, mock_meta: MagicMock, mock_iter: MagicMock, tmp_path: Path
-    ) -> None:
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_empty_text(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
         """Should handle PDF with no extractable text."""
-        mock_meta.return_value = {"title": "Empty", "page_count": "1"}
-        mock_iter.return_value = iter([])
+        mock_fitz.open.return_value = _mock_pdf_doc([""], title="Empty")
 
         pdf_path = tmp_path / "empty.pdf"
         pdf_path.write_bytes(b"dummy")
@@ -259,6 +261,103 @@ class TestBuildChunks:
         # Should return no chunks for empty text
         assert len(chunks) == 0
 
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_opens_pdf_once(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
+        """Should share one open document between metadata and text extraction."""
+        mock_doc = _mock_pdf_doc(["Page one.", "Page two."], title="Once")
+        mock_fitz.open.return_value = mock_doc
+
+        pdf_path = tmp_path / "once.pdf"
+        pdf_path.write_bytes(b"dummy")
+
+        chunks = list(build_chunks(pdf_path))
+
+        assert chunks[0].metadata["title"] == "Once"
+        mock_fitz.open.assert_called_once_with(pdf_path)
+        mock_doc.close.assert_called_once()
+
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_open_error(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
+        """Should yield nothing when the PDF cannot be opened."""
+        mock_fitz.open.side_effect = Exception("Cannot open file")
+
+        chunks = list(build_chunks(tmp_path / "broken.pdf"))
+
+        assert chunks == []
+
+    @patch("docfinder.ingestion.pdf_loader.fitz")
+    def test_build_chunks_sizes_from_page_count(self, mock_fitz: MagicMock, tmp_path: Path) -> None:
+        """Should pick chunk sizes from the page count when none are given."""
+        mock_fitz.open.return_value = _mock_pdf_doc([""] * 120, title="Big")
+
+        pdf_path = tmp_path / "big.pdf"
+        pdf_path.write_bytes(b"dummy")
+
+        with patch("docfinder.utils.text.chunk_text_stream_paged") as mock_chunker:
+            mock_chunker.return_value = iter([])
+            list(build_chunks(pdf_path))
+            assert mock_chunker.call_args[1] == {"max_chars": 800, "overlap": 160}
+
+            # A user-set size keeps the rule's overlap ratio (160/800) instead
+            # of borrowing an overlap sized for 800-char chunks.
+            mock_chunker.reset_mock()
+            list(build_chunks(pdf_path, max_chars=100))
+            assert mock_chunker.call_args[1] == {"max_chars": 100, "overlap": 20}
+
+            mock_chunker.reset_mock()
+            list(build_chunks(pdf_path, overlap=50))
+            assert mock_chunker.call_args[1] == {"max_chars": 800, "overlap": 50}
+
+
+class TestBuildChunksMany:
+    """Test batch chunk building across documents."""
+
+    def test_in_process_preserves_order(self, tmp_path: Path) -> None:
+        from docfinder.ingestion.pdf_loader import build_chunks_many
+
+        first = tmp_path / "a.txt"
+        second = tmp_path / "b.txt"
+        first.write_text("First document.")
+        second.write_text("Second document.")
+
+        results = list(build_chunks_many([first, second], workers=1))
+
+        assert [path for path, _ in results] == [first, second]
+        assert results[0][1][0].text == "First document."
+        assert results[1][1][0].text == "Second document."
+
+    def test_failure_yields_empty_chunks(self, tmp_path: Path) -> None:
+        from docfinder.ingestion.pdf_loader import build_chunks_many
+
+        broken = tmp_path / "broken.txt"
+        with patch("docfinder.ingestion.pdf_loader.build_chunks", side_effect=Exception("boom")):
+            results = list(build_chunks_many([broken], workers=1))
+
+        assert results == [(broken, [])]
+
+    def test_empty_input(self) -> None:
+        from docfinder.ingestion.pdf_loader import build_chunks_many
+
+        assert list(build_chunks_many([])) == []
+
+
+class TestChunkParamsFor:
+    """Test page-count based chunk sizing rules."""
+
+    def test_rules_by_page_count(self) -> None:
+        from docfinder.ingestion.pdf_loader import _chunk_params_for
+
+        assert _chunk_params_for(1) == (1500, 150)
+        assert _chunk_params_for(10) == (1500, 150)
+        assert _chunk_params_for(11) == (1000, 200)
+        assert _chunk_params_for(200) == (800, 160)
+        assert _chunk_params_for(5000) == (600, 120)
+
+    def test_unknown_page_count_uses_defaults(self) -> None:
+        from docfinder.ingestion.pdf_loader import _chunk_params_for
+
+        assert _chunk_params_for(None) == (1200, 200)
+
 
 class TestTableExtraction:
     """Test PDF table extraction via _extract_page_text."""
@@ -730,32 +829,6 @@ class TestIterTextBySuffix:
         assert parts == []
 
 
-class TestGetTitle:
-    """Test _get_title helper."""
-
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_pdf_with_title(self, mock_meta: MagicMock, tmp_path: Path) -> None:
-        from docfinder.ingestion.pdf_loader import _get_title
-
-        mock_meta.return_value = {"title": "My PDF Title"}
-        result = _get_title(tmp_path / "doc.pdf")
-        assert result == "My PDF Title"
-
-    @patch("docfinder.ingestion.pdf_loader.get_pdf_metadata")
-    def test_pdf_metadata_error(self, mock_meta: MagicMock, tmp_path: Path) -> None:
-        from docfinder.ingestion.pdf_loader import _get_title
-
-        mock_meta.side_effect = Exception("cannot open")
-        result = _get_title(tmp_path / "broken.pdf")
-        assert result == "broken"
-
-    def test_non_pdf_uses_stem(self, tmp_path: Path) -> None:
-        from docfinder.ingestion.pdf_loader import _get_title
-
-        result = _get_title(tmp_path / "report.txt")
-        assert result == "report"
-
-
 class TestIterPagedText:
     """Test the paged text dispatcher."""
 
@@ -122,8 +122,7 @@ class TestGetContextWindow:
         results = store_with_chunks.search(query, top_k=1)
 
         assert len(results) == 1
-        assert "document_id" in results[0]
-        assert isinstance(results[0]["document_id"], int)
+        assert isinstance(results[0].document_id, int)
 
 
 # ── get_context_by_page tests ─────────────────────────────────────────────
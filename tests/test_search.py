@@ -4,12 +4,47 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Sequence
 from unittest.mock import MagicMock
 
 import numpy as np
 
 from docfinder.index.reranker import Reranker
-from docfinder.index.search import Searcher, SearchResult
+from docfinder.index.search import Searcher, SearchResult, StoreRow
+
+
+class FakeEmbedder:
+    """Minimal embedder returning a fixed query vector and recording queries."""
+
+    def __init__(self, vector: np.ndarray) -> None:
+        self.vector = vector
+        self.calls: list[str] = []
+
+    def embed_query(self, text: str) -> np.ndarray:
+        self.calls.append(text)
+        return self.vector
+
+
+class FakeStore:
+    """Minimal vector store returning fixed rows and recording search calls."""
+
+    def __init__(self, rows: list[StoreRow] | None = None) -> None:
+        self.rows = rows or []
+        self.calls: list[dict] = []
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        *,
+        top_k: int = 10,
+        folders: Sequence[str] | None = None,
+    ) -> list[StoreRow]:
+        self.calls.append({"embedding": embedding, "top_k": top_k, "folders": folders})
+        return self.rows
+
+
+def _query_vector(*values: float) -> np.ndarray:
+    return np.array(values or (0.1,), dtype=np.float32)
 
 
 class TestSearchResult:
@@ -39,24 +74,22 @@ class TestSearcher:
 
     def test_search_simple(self) -> None:
         """Should perform search and return results."""
-        # Mock embedder
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1, 0.2, 0.3])
-
-        # Mock store
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": "/doc1.pdf",
-                "title": "Document 1",
-                "chunk_index": 0,
-                "score": 0.95,
-                "text": "Relevant text",
-                "metadata": json.dumps({"page": 1}),
-            }
-        ]
+        embedder = FakeEmbedder(_query_vector(0.1, 0.2, 0.3))
+        store = FakeStore(
+            [
+                StoreRow(
+                    path="/doc1.pdf",
+                    title="Document 1",
+                    chunk_index=0,
+                    score=0.95,
+                    text="Relevant text",
+                    metadata=json.dumps({"page": 1}),
+                    document_id=1,
+                )
+            ]
+        )
 
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(embedder, store)
         results = searcher.search("test query", top_k=10)
 
         assert len(results) == 1
@@ -65,45 +98,68 @@ class TestSearcher:
         assert results[0].score == 0.95
         assert results[0].metadata == {"page": 1}
 
-        # Verify embedder was called
-        mock_embedder.embed_query.assert_called_once_with("test query")
-        # Verify store was called with embedding and top_k
-        mock_store.search.assert_called_once()
+        # Verify embedder and store were each called once
+        assert embedder.calls == ["test query"]
+        assert len(store.calls) == 1
+
+    def test_search_passes_float32_query(self) -> None:
+        """Should hand the store a float32 query vector even for float64 input."""
+        embedder = FakeEmbedder(np.array([0.1, 0.2, 0.3]))
+        store = FakeStore()
+
+        searcher = Searcher(embedder, store)
+        searcher.search("query")
+
+        assert store.calls[0]["embedding"].dtype == np.float32
+
+    def test_search_passes_contiguous_query_without_copy(self) -> None:
+        """Contiguous float32 queries should be forwarded as-is; strided ones made contiguous."""
+        vector = _query_vector(0.1, 0.2, 0.3)
+        store = FakeStore()
+        Searcher(FakeEmbedder(vector), store).search("query")
+        assert store.calls[0]["embedding"] is vector
+
+        strided = np.arange(6, dtype=np.float32)[::2]
+        store = FakeStore()
+        Searcher(FakeEmbedder(strided), store).search("query")
+        assert store.calls[0]["embedding"].flags["C_CONTIGUOUS"]
 
     def test_search_multiple_results(self) -> None:
         """Should return multiple search results."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1, 0.2])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": "/doc1.pdf",
-                "title": "Doc 1",
-                "chunk_index": 0,
-                "score": 0.95,
-                "text": "Text 1",
-                "metadata": "{}",
-            },
-            {
-                "path": "/doc2.pdf",
-                "title": "Doc 2",
-                "chunk_index": 5,
-                "score": 0.85,
-                "text": "Text 2",
-                "metadata": "{}",
-            },
-            {
-                "path": "/doc3.pdf",
-                "title": "Doc 3",
-                "chunk_index": 2,
-                "score": 0.75,
-                "text": "Text 3",
-                "metadata": "{}",
-            },
-        ]
+        embedder = FakeEmbedder(_query_vector(0.1, 0.2))
+        store = FakeStore(
+            [
+                StoreRow(
+                    path="/doc1.pdf",
+                    title="Doc 1",
+                    chunk_index=0,
+                    score=0.95,
+                    text="Text 1",
+                    metadata="{}",
+                    document_id=1,
+                ),
+                StoreRow(
+                    path="/doc2.pdf",
+                    title="Doc 2",
+                    chunk_index=5,
+                    score=0.85,
+                    text="Text 2",
+                    metadata="{}",
+                    document_id=1,
+                ),
+                StoreRow(
+                    path="/doc3.pdf",
+                    title="Doc 3",
+                    chunk_index=2,
+                    score=0.75,
+                    text="Text 3",
+                    metadata="{}",
+                    document_id=1,
+                ),
+            ]
+        )
 
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(embedder, store)
         results = searcher.search("query", top_k=3)
 
         assert len(results) == 3
@@ -113,137 +169,136 @@ class TestSearcher:
 
     def test_search_empty_results(self) -> None:
         """Should handle empty search results."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = []
-
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(FakeEmbedder(_query_vector()), FakeStore())
         results = searcher.search("no results query")
 
         assert len(results) == 0
 
     def test_search_no_metadata(self) -> None:
         """Should handle results without metadata."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": "/doc.pdf",
-                "title": "Doc",
-                "chunk_index": 0,
-                "score": 0.9,
-                "text": "Text",
-                "metadata": None,
-            }
-        ]
+        store = FakeStore(
+            [
+                StoreRow(
+                    path="/doc.pdf",
+                    title="Doc",
+                    chunk_index=0,
+                    score=0.9,
+                    text="Text",
+                    metadata=None,
+                    document_id=1,
+                )
+            ]
+        )
 
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(FakeEmbedder(_query_vector()), store)
         results = searcher.search("query")
 
         assert len(results) == 1
         assert results[0].metadata == {}
 
+    def test_search_empty_metadata_skips_parser(self, monkeypatch) -> None:
+        """Rows with None or "{}" metadata should not reach the JSON decoder."""
+        from docfinder.index import search as search_module
+
+        def _fail(raw):
+            raise AssertionError(f"decoder called with {raw!r}")
+
+        monkeypatch.setattr(search_module, "_json_loads", _fail)
+        store = FakeStore(
+            [
+                StoreRow("/a.pdf", "A", 0, 0.9, "Text", None, 1),
+                StoreRow("/b.pdf", "B", 0, 0.8, "Text", "{}", 2),
+            ]
+        )
+
+        searcher = Searcher(FakeEmbedder(_query_vector()), store)
+        results = searcher.search("query")
+
+        assert [r.metadata for r in results] == [{}, {}]
+
     def test_search_custom_top_k(self) -> None:
         """Should respect custom top_k parameter."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = []
+        store = FakeStore()
 
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(FakeEmbedder(_query_vector()), store)
         searcher.search("query", top_k=25)
 
         # Verify top_k was passed to store
-        call_args = mock_store.search.call_args
-        assert call_args[1]["top_k"] == 25
+        assert store.calls[0]["top_k"] == 25
 
     def test_search_passes_folder_filters(self) -> None:
         """Should pass selected folders down to storage search."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
+        store = FakeStore()
 
-        mock_store = MagicMock()
-        mock_store.search.return_value = []
-
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(FakeEmbedder(_query_vector()), store)
         folders = ["/Users/test/articles", "/Users/test/posters"]
         searcher.search("query", top_k=10, folders=folders)
 
-        call_args = mock_store.search.call_args
-        assert call_args[1]["folders"] == folders
+        assert store.calls[0]["folders"] == folders
 
     def test_search_metadata_parsing(self) -> None:
         """Should parse JSON metadata correctly."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
         complex_metadata = {"page": 5, "section": "intro", "tags": ["important", "review"]}
 
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": "/doc.pdf",
-                "title": "Doc",
-                "chunk_index": 0,
-                "score": 0.9,
-                "text": "Text",
-                "metadata": json.dumps(complex_metadata),
-            }
-        ]
+        store = FakeStore(
+            [
+                StoreRow(
+                    path="/doc.pdf",
+                    title="Doc",
+                    chunk_index=0,
+                    score=0.9,
+                    text="Text",
+                    metadata=json.dumps(complex_metadata),
+                    document_id=1,
+                )
+            ]
+        )
 
-        searcher = Searcher(mock_embedder, mock_store)
+        searcher = Searcher(FakeEmbedder(_query_vector()), store)
         results = searcher.search("query")
 
         assert results[0].metadata == complex_metadata
 
     def test_search_without_reranker(self) -> None:
         """Should work identically when reranker is None."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1, 0.2])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": "/doc.pdf",
-                "title": "Doc",
-                "chunk_index": 0,
-                "score": 0.9,
-                "text": "Text",
-                "metadata": "{}",
-            }
-        ]
+        store = FakeStore(
+            [
+                StoreRow(
+                    path="/doc.pdf",
+                    title="Doc",
+                    chunk_index=0,
+                    score=0.9,
+                    text="Text",
+                    metadata="{}",
+                    document_id=1,
+                )
+            ]
+        )
 
-        searcher = Searcher(mock_embedder, mock_store, reranker=None)
+        searcher = Searcher(FakeEmbedder(_query_vector(0.1, 0.2)), store, reranker=None)
         results = searcher.search("query", top_k=5)
 
         assert len(results) == 1
         assert results[0].score == 0.9
         # Without reranker, top_k is passed directly to store
-        call_args = mock_store.search.call_args
-        assert call_args[1]["top_k"] == 5
+        assert store.calls[0]["top_k"] == 5
 
     def test_search_with_reranker_fetches_more_candidates(self) -> None:
         """With reranker, should fetch more candidates from the store."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = [
-            {
-                "path": f"/doc{i}.pdf",
-                "title": f"Doc {i}",
-                "chunk_index": 0,
-                "score": 0.9 - i * 0.01,
-                "text": f"Text {i}",
-                "metadata": "{}",
-            }
-            for i in range(30)
-        ]
+        store = FakeStore(
+            [
+                StoreRow(
+                    path=f"/doc{i}.pdf",
+                    title=f"Doc {i}",
+                    chunk_index=0,
+                    score=0.9 - i * 0.01,
+                    text=f"Text {i}",
+                    metadata="{}",
+                    document_id=1,
+                )
+                for i in range(30)
+            ]
+        )
 
         mock_reranker = MagicMock(spec=Reranker)
         mock_reranker.rerank.return_value = [
@@ -254,15 +309,15 @@ class TestSearcher:
                 "score": 0.99,
                 "text": "Text 5",
                 "metadata": "{}",
+                "document_id": 6,
             }
         ]
 
-        searcher = Searcher(mock_embedder, mock_store, reranker=mock_reranker)
+        searcher = Searcher(FakeEmbedder(_query_vector()), store, reranker=mock_reranker)
         results = searcher.search("query", top_k=5)
 
         # Should fetch max(5*3, 30) = 30 candidates
-        call_args = mock_store.search.call_args
-        assert call_args[1]["top_k"] == 30
+        assert store.calls[0]["top_k"] == 30
 
         # Should have called reranker with the candidates
         mock_reranker.rerank.assert_called_once()
@@ -276,15 +331,9 @@ class TestSearcher:
 
     def test_search_with_reranker_empty_results(self) -> None:
         """With reranker, should handle empty store results gracefully."""
-        mock_embedder = MagicMock()
-        mock_embedder.embed_query.return_value = np.array([0.1])
-
-        mock_store = MagicMock()
-        mock_store.search.return_value = []
-
         mock_reranker = MagicMock(spec=Reranker)
 
-        searcher = Searcher(mock_embedder, mock_store, reranker=mock_reranker)
+        searcher = Searcher(FakeEmbedder(_query_vector()), FakeStore(), reranker=mock_reranker)
         results = searcher.search("query", top_k=5)
 
         assert len(results) == 0
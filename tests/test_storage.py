@@ -7,7 +7,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from docfinder.index.storage import SQLiteVectorStore
+from docfinder.index.storage import SQLiteVectorStore, StoreRow, decode_metadata
 from docfinder.models import ChunkRecord, DocumentMetadata
 
 
@@ -72,6 +72,13 @@ class TestSQLiteVectorStore:
         result = cursor.fetchone()
         assert result[0] == 1  # NORMAL mode
 
+        # Check read/cache tuning
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        # mmap_size is capped by SQLITE_MAX_MMAP_SIZE and may be 0 if mmap is unsupported
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] in (0, 268435456)
+
     def test_connection_property(self, temp_db):
         """Test connection property returns sqlite3.Connection."""
         assert isinstance(temp_db.connection, sqlite3.Connection)
@@ -89,6 +96,54 @@ class TestSQLiteVectorStore:
             conn.execute("SELECT 1")
 
 
+class TestOpenSharedStore:
+    """Test SQLiteVectorStore.open reference-counted sharing."""
+
+    def test_open_returns_shared_instance_until_last_close(self, tmp_path):
+        db_path = tmp_path / "shared.db"
+        first = SQLiteVectorStore.open(db_path, dimension=384)
+        second = SQLiteVectorStore.open(tmp_path / "." / "shared.db", dimension=384)
+        assert first is second
+
+        first.close()
+        # Still usable by the remaining holder
+        assert second.connection.execute("SELECT 1").fetchone()[0] == 1
+
+        second.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            second.connection.execute("SELECT 1")
+        assert SQLiteVectorStore.open(db_path, dimension=384) is not first
+        SQLiteVectorStore.open(db_path, dimension=384).close()
+
+    def test_shared_store_usable_from_threads(self, tmp_path):
+        import threading
+
+        store = SQLiteVectorStore.open(tmp_path / "threads.db", dimension=384)
+        errors = []
+
+        def _worker(i):
+            try:
+                doc = DocumentMetadata(
+                    path=Path(f"/tmp/t{i}.pdf"), title=f"T{i}", sha256=f"h{i}", mtime=1.0, size=1
+                )
+                chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata={})]
+                store.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+                store.search(np.random.rand(384).astype("float32"), top_k=3)
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        try:
+            assert errors == []
+            assert store.get_stats()["document_count"] == 8
+        finally:
+            store.close()
+
+
 class TestTransaction:
     """Test transaction context manager."""
 
@@ -121,6 +176,36 @@ class TestTransaction:
         assert cursor.fetchone()[0] == 0
 
 
+class TestBulkContext:
+    """Test bulk_context index and pragma handling."""
+
+    def test_drops_and_rebuilds_chunk_index(self, temp_db):
+        """The chunk index is absent inside the context and restored afterwards."""
+
+        def _index_exists():
+            return (
+                temp_db.connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='index' "
+                    "AND name='idx_chunks_document_id'"
+                ).fetchone()
+                is not None
+            )
+
+        doc = DocumentMetadata(
+            path=Path("/tmp/test.pdf"), title="Test", sha256="abc123", mtime=1234567890.0, size=1000
+        )
+        chunks = [ChunkRecord(document_path=doc.path, index=0, text="Chunk", metadata={})]
+
+        with temp_db.bulk_context() as store:
+            assert not _index_exists()
+            assert store.connection.execute("PRAGMA synchronous").fetchone()[0] == 0
+            store.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+
+        assert _index_exists()
+        assert temp_db.connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert temp_db.get_document_chunk_count(1) == 1
+
+
 class TestUpsertDocument:
     """Test document and chunks insertion/update."""
 
@@ -225,6 +310,86 @@ class TestUpsertDocument:
         )
         assert cursor.fetchone()[0] == 2
 
+    def test_chunks_written_in_index_order(self, temp_db):
+        """Out-of-order chunks are stored by chunk_index with their own embeddings."""
+        doc = DocumentMetadata(
+            path=Path("/tmp/test.pdf"), title="Test", sha256="abc123", mtime=1234567890.0, size=1000
+        )
+        chunks = [
+            ChunkRecord(document_path=doc.path, index=i, text=f"Chunk {i}", metadata={})
+            for i in (2, 0, 1)
+        ]
+        embeddings = np.random.rand(3, 384).astype("float32")
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        temp_db.upsert_document(doc, chunks, embeddings)
+
+        rows = temp_db.connection.execute(
+            "SELECT chunk_index, text, embedding FROM chunks ORDER BY id"
+        ).fetchall()
+        assert [row["chunk_index"] for row in rows] == [0, 1, 2]
+        for row in rows:
+            expected = embeddings[[c.index for c in chunks].index(row["chunk_index"])]
+            assert row["text"] == f"Chunk {row['chunk_index']}"
+            np.testing.assert_allclose(
+                np.frombuffer(row["embedding"], "float32"), expected, rtol=1e-6
+            )
+
+    def test_get_document_stat(self, temp_db):
+        """Stored mtime/size are returned, and refreshed when only the stat changes."""
+        doc = DocumentMetadata(
+            path=Path("/tmp/test.pdf"), title="Test", sha256="abc123", mtime=1234567890.0, size=1000
+        )
+        chunks = [ChunkRecord(document_path=doc.path, index=0, text="Chunk", metadata={})]
+        embeddings = np.random.rand(1, 384).astype("float32")
+
+        assert temp_db.get_document_stat(doc.path) is None
+        temp_db.upsert_document(doc, chunks, embeddings)
+        assert temp_db.get_document_stat(doc.path) == (1234567890.0, 1000)
+
+        touched = DocumentMetadata(
+            path=doc.path, title="Test", sha256="abc123", mtime=1234567999.0, size=1000
+        )
+        assert temp_db.upsert_document(touched, chunks, embeddings) == "skipped"
+        assert temp_db.get_document_stat(doc.path) == (1234567999.0, 1000)
+
+    def test_bulk_upsert(self, temp_db):
+        """bulk_upsert should return per-item statuses from a single transaction."""
+        docs = [
+            DocumentMetadata(
+                path=Path(f"/tmp/doc{i}.pdf"), title=f"Doc {i}", sha256=f"h{i}", mtime=1.0, size=1
+            )
+            for i in range(3)
+        ]
+        items = [
+            (
+                doc,
+                [ChunkRecord(document_path=doc.path, index=0, text="Chunk", metadata={})],
+                np.random.rand(1, 384).astype("float32"),
+            )
+            for doc in docs
+        ]
+
+        assert temp_db.bulk_upsert(items) == ["inserted"] * 3
+        assert temp_db.bulk_upsert(items[:1]) == ["skipped"]
+        assert temp_db.get_stats()["chunk_count"] == 3
+
+    def test_bulk_upsert_rolls_back_on_error(self, temp_db):
+        """A failing item should roll back the whole batch."""
+        good = DocumentMetadata(path=Path("/tmp/a.pdf"), title="A", sha256="a", mtime=1.0, size=1)
+        bad = DocumentMetadata(path=Path("/tmp/b.pdf"), title="B", sha256="b", mtime=1.0, size=1)
+        chunk = [ChunkRecord(document_path=good.path, index=0, text="Chunk", metadata={})]
+
+        with pytest.raises(ValueError):
+            temp_db.bulk_upsert(
+                [
+                    (good, chunk, np.random.rand(1, 384).astype("float32")),
+                    (bad, chunk, np.random.rand(2, 384).astype("float32")),
+                ]
+            )
+
+        assert temp_db.get_stats()["document_count"] == 0
+
     def test_upsert_validation(self, temp_db):
         """Test validation of embeddings and chunks length."""
         doc = DocumentMetadata(
@@ -236,6 +401,21 @@ class TestUpsertDocument:
         with pytest.raises(ValueError, match="Embeddings and chunks length mismatch"):
             temp_db.upsert_document(doc, chunks, embeddings)
 
+    def test_upsert_document_without_chunks(self, temp_db):
+        """A document with no chunks should still be recorded."""
+        docs = [
+            DocumentMetadata(
+                path=Path(f"/tmp/empty{i}.pdf"), title="Empty", sha256="e", mtime=1.0, size=1
+            )
+            for i in range(2)
+        ]
+        empty = np.empty((0, 384), dtype="float32")
+
+        assert temp_db.upsert_document(docs[0], [], empty) == "inserted"
+        assert temp_db.bulk_upsert([(docs[1], [], empty)]) == ["inserted"]
+        assert temp_db.get_stats()["document_count"] == 2
+        assert temp_db.get_stats()["chunk_count"] == 0
+
     def test_chunks_metadata_serialization(self, temp_db):
         """Test that chunk metadata is properly serialized to JSON."""
         doc = DocumentMetadata(
@@ -255,9 +435,170 @@ class TestUpsertDocument:
 
         cursor = temp_db.connection.execute("SELECT metadata FROM chunks")
         row = cursor.fetchone()
-        metadata = json.loads(row["metadata"])
+        metadata = decode_metadata(row["metadata"])
         assert metadata == {"page": 5, "section": "intro"}
 
+    def test_embeddings_stored_per_row(self, temp_db):
+        """Each chunk's BLOB should hold its own float32 embedding row, L2-normalized."""
+        doc = DocumentMetadata(
+            path=Path("/tmp/test.pdf"), title="Test", sha256="abc123", mtime=1234567890.0, size=1000
+        )
+        chunks = [
+            ChunkRecord(document_path=doc.path, index=i, text=f"Chunk {i}", metadata={})
+            for i in range(3)
+        ]
+        # float64 and Fortran-ordered input must still be stored as C-ordered float32 rows
+        embeddings = np.asfortranarray(np.random.rand(3, 384))
+
+        temp_db.upsert_document(doc, chunks, embeddings)
+
+        rows = temp_db.connection.execute(
+            "SELECT embedding FROM chunks ORDER BY chunk_index"
+        ).fetchall()
+        stored = np.vstack([np.frombuffer(row["embedding"], dtype="float32") for row in rows])
+        expected = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.testing.assert_allclose(stored, expected.astype("float32"), rtol=1e-6)
+        np.testing.assert_allclose(np.linalg.norm(stored, axis=1), 1.0, rtol=1e-6)
+
+
+class TestCompressedText:
+    """Test optional zstd compression of chunk text."""
+
+    def test_compressed_text_round_trip(self, tmp_path):
+        """Compressed rows are stored as BLOBs and read back as the original text."""
+        pytest.importorskip("zstandard")
+        store = SQLiteVectorStore(tmp_path / "z.db", dimension=384, compress_text=True)
+        try:
+            doc = DocumentMetadata(
+                path=Path("/tmp/z.pdf"), title="Z", sha256="z", mtime=1.0, size=1
+            )
+            text = "Compressible sentence. " * 50
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text=text, metadata={})]
+            embeddings = np.random.rand(1, 384).astype("float32")
+            store.upsert_document(doc, chunks, embeddings)
+
+            raw = store.connection.execute("SELECT text FROM chunks").fetchone()[0]
+            assert isinstance(raw, bytes) and len(raw) < len(text)
+            assert store.get_all_chunks(1)[0]["text"] == text
+            assert store.search(embeddings[0], top_k=1)[0].text == text
+        finally:
+            store.close()
+
+        # A store opened without the flag still reads the compressed rows
+        plain = SQLiteVectorStore(tmp_path / "z.db", dimension=384)
+        try:
+            assert plain.get_context_window(1, 0)[0]["text"] == text
+        finally:
+            plain.close()
+
+
+class TestPackedMetadata:
+    """Test optional MessagePack encoding of chunk metadata."""
+
+    def test_packed_metadata_round_trip(self, tmp_path):
+        """Packed rows are stored as BLOBs and decoded wherever metadata is read."""
+        msgpack = pytest.importorskip("msgpack")
+        store = SQLiteVectorStore(tmp_path / "m.db", dimension=384, pack_metadata=True)
+        try:
+            doc = DocumentMetadata(
+                path=Path("/tmp/m.pdf"), title="M", sha256="m", mtime=1.0, size=1
+            )
+            meta = {"title": "M", "page": 3}
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata=meta)]
+            embeddings = np.random.rand(1, 384).astype("float32")
+            store.upsert_document(doc, chunks, embeddings)
+
+            raw = store.connection.execute("SELECT metadata FROM chunks").fetchone()[0]
+            assert isinstance(raw, bytes)
+            assert msgpack.unpackb(raw, raw=False) == meta
+            assert decode_metadata(store.search(embeddings[0], top_k=1)[0].metadata) == meta
+            assert store.get_context_by_page(1, 3)[0]["text"] == "Text"
+        finally:
+            store.close()
+
+    def test_decode_metadata_handles_json_and_empty(self):
+        """JSON text and missing values decode without msgpack."""
+        assert decode_metadata('{"page": 1}') == {"page": 1}
+        assert decode_metadata(None) == {}
+        assert decode_metadata("") == {}
+
+
+class TestVectorIndex:
+    """Test the optional sqlite-vec search path."""
+
+    @staticmethod
+    def _fill(store, count=5):
+        rng = np.random.default_rng(0)
+        embeddings = rng.random((count, 384), dtype=np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        for i in range(count):
+            doc = DocumentMetadata(
+                path=Path(f"/tmp/v{i}.pdf"), title=f"V{i}", sha256=f"v{i}", mtime=1.0, size=1
+            )
+            chunk = ChunkRecord(document_path=doc.path, index=0, text=f"Text {i}", metadata={})
+            store.upsert_document(doc, [chunk], embeddings[i : i + 1])
+        return embeddings
+
+    def test_falls_back_without_extension(self, tmp_path, monkeypatch):
+        """Without sqlite-vec the store keeps working with the in-memory scan."""
+        from docfinder.index import storage
+
+        monkeypatch.setattr(storage, "sqlite_vec", None)
+        store = SQLiteVectorStore(tmp_path / "v.db", dimension=384, vector_index=True)
+        try:
+            assert store.vector_index is False
+            embeddings = self._fill(store)
+            assert store.search(embeddings[2], top_k=1)[0].title == "V2"
+        finally:
+            store.close()
+
+    def test_insert_chunks_in_batches_mirrors_each_row_once(self, temp_db):
+        """Several insert_chunks calls for one document must not re-mirror earlier rows."""
+        # A plain table with the same rowid constraint stands in for vec0
+        temp_db.connection.execute(
+            "CREATE TABLE chunk_vec(rowid INTEGER PRIMARY KEY, embedding BLOB)"
+        )
+        temp_db.vector_index = True
+        doc = DocumentMetadata(
+            path=Path("/tmp/big.pdf"), title="Big", sha256="b", mtime=1.0, size=1
+        )
+
+        with temp_db.transaction():
+            doc_id, _ = temp_db.init_document(doc)
+            for start in (0, 2):
+                chunks = [
+                    ChunkRecord(document_path=doc.path, index=i, text=f"Chunk {i}", metadata={})
+                    for i in range(start, start + 2)
+                ]
+                temp_db.insert_chunks(doc_id, chunks, np.random.rand(2, 384))
+
+        conn = temp_db.connection
+        mirrored = [r[0] for r in conn.execute("SELECT rowid FROM chunk_vec ORDER BY rowid")]
+        chunk_ids = [r[0] for r in conn.execute("SELECT id FROM chunks ORDER BY id")]
+        assert len(chunk_ids) == 4
+        assert mirrored == chunk_ids
+
+    def test_vector_index_matches_scan(self, tmp_path):
+        """KNN results from sqlite-vec should match the in-memory scan."""
+        pytest.importorskip("sqlite_vec")
+        # Fill without the extension so opening with it has to backfill chunk_vec
+        plain = SQLiteVectorStore(tmp_path / "v.db", dimension=384)
+        embeddings = self._fill(plain)
+        expected = [(r.title, round(r.score, 4)) for r in plain.search(embeddings[1], top_k=3)]
+        plain.close()
+
+        store = SQLiteVectorStore(tmp_path / "v.db", dimension=384, vector_index=True)
+        try:
+            if not store.vector_index:
+                pytest.skip("sqlite3 cannot load extensions here")
+            results = store.search(embeddings[1], top_k=3)
+            assert [(r.title, round(r.score, 4)) for r in results] == expected
+
+            store.delete_document_by_path("/tmp/v1.pdf")
+            assert store.search(embeddings[1], top_k=1)[0].title != "V1"
+        finally:
+            store.close()
+
 
 class TestSearch:
     """Test vector search."""
@@ -270,6 +611,20 @@ class TestSearch:
 
         assert results == []
 
+    def test_search_scores_are_cosine(self, temp_db):
+        """Rows and query are normalized, so scores don't depend on vector length."""
+        doc = DocumentMetadata(
+            path=Path("/tmp/cos.pdf"), title="Cos", sha256="cos", mtime=1.0, size=1
+        )
+        embedding = np.zeros((1, 384), dtype="float32")
+        embedding[0, :2] = (3.0, 4.0)
+        chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata={})]
+        temp_db.upsert_document(doc, chunks, embedding)
+
+        results = temp_db.search(embedding[0] * 10, top_k=1)
+
+        assert results[0].score == pytest.approx(1.0, abs=1e-6)
+
     def test_search_returns_top_k(self, temp_db):
         """Test that search returns top_k results."""
         # Insert 10 documents
@@ -330,15 +685,13 @@ class TestSearch:
 
         assert len(results) == 1
         result = results[0]
-        assert "path" in result
-        assert "title" in result
-        assert "chunk_index" in result
-        assert "text" in result
-        assert "metadata" in result
-        assert "score" in result
-        assert result["path"] == str(doc.path)
-        assert result["title"] == "Test Doc"
-        assert result["text"] == "Sample text"
+        assert isinstance(result, StoreRow)
+        assert result.path == str(doc.path)
+        assert result.title == "Test Doc"
+        assert result.chunk_index == 0
+        assert result.text == "Sample text"
+        assert json.loads(result.metadata) == {"page": 1}
+        assert isinstance(result.score, float)
 
     def test_search_scores_descending(self, temp_db):
         """Test that search results are sorted by score descending."""
@@ -359,9 +712,31 @@ class TestSearch:
         results = temp_db.search(query, top_k=5)
 
         # Verify scores are descending
-        scores = [r["score"] for r in results]
+        scores = [r.score for r in results]
         assert scores == sorted(scores, reverse=True)
 
+    def test_search_top_k_zero_returns_nothing(self, temp_db):
+        """A non-positive top_k should yield no results rather than every chunk."""
+        for i in range(3):
+            doc = DocumentMetadata(
+                path=Path(f"/tmp/doc{i}.pdf"), title=f"Doc {i}", sha256=f"h{i}", mtime=1.0, size=1
+            )
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata={})]
+            temp_db.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+
+        assert temp_db.search(np.random.rand(384).astype("float32"), top_k=0) == []
+
+    def test_search_leaves_no_open_transaction(self, temp_db):
+        """Hydrating hits through the temp table must not leave a transaction open."""
+        doc = DocumentMetadata(path=Path("/tmp/a.pdf"), title="A", sha256="a", mtime=1.0, size=1)
+        chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata={})]
+        temp_db.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+
+        results = temp_db.search(np.random.rand(384).astype("float32"), top_k=5)
+
+        assert [r.title for r in results] == ["A"]
+        assert not temp_db.connection.in_transaction
+
     def test_search_with_folder_filters(self, temp_db):
         """Search should return only results from selected folders."""
         doc_a = DocumentMetadata(
@@ -389,7 +764,77 @@ class TestSearch:
         results = temp_db.search(query, top_k=10, folders=["/tmp/folder_a"])
 
         assert len(results) == 1
-        assert _normalize_path(results[0]["path"]) == "/tmp/folder_a/doc1.pdf"
+        assert _normalize_path(results[0].path) == "/tmp/folder_a/doc1.pdf"
+
+    def test_search_reuses_and_refreshes_embedding_matrix(self, temp_db):
+        """The cached matrix should survive reads and be rebuilt after writes."""
+
+        def _add(i):
+            doc = DocumentMetadata(
+                path=Path(f"/tmp/doc{i}.pdf"),
+                title=f"Doc {i}",
+                sha256=f"hash{i}",
+                mtime=1234567890.0,
+                size=1000,
+            )
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text=f"Text {i}", metadata={})]
+            temp_db.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+
+        _add(0)
+        query = np.random.rand(384).astype("float32")
+        assert len(temp_db.search(query)) == 1
+        cached = temp_db._matrix
+        temp_db.search(query)
+        assert temp_db._matrix is cached
+
+        _add(1)
+        assert len(temp_db.search(query)) == 2
+
+        temp_db.delete_document_by_path("/tmp/doc0.pdf")
+        assert [r.title for r in temp_db.search(query)] == ["Doc 1"]
+
+    def test_quantized_search_matches_exact_search(self, temp_db):
+        """int8 candidate selection plus exact rescoring should match float32 search."""
+        rng = np.random.default_rng(0)
+        for i in range(50):
+            doc = DocumentMetadata(
+                path=Path(f"/tmp/doc{i}.pdf"),
+                title=f"Doc {i}",
+                sha256=f"hash{i}",
+                mtime=1234567890.0,
+                size=1000,
+            )
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text=f"Text {i}", metadata={})]
+            temp_db.upsert_document(doc, chunks, rng.standard_normal((1, 384)).astype("float32"))
+
+        quantized = SQLiteVectorStore(temp_db.db_path, dimension=384, quantize=True)
+        try:
+            query = rng.standard_normal(384).astype("float32")
+            exact = temp_db.search(query, top_k=5)
+            approx = quantized.search(query, top_k=5)
+            assert quantized._matrix[2].dtype == np.int8
+        finally:
+            quantized.close()
+
+        assert [r.title for r in approx] == [r.title for r in exact]
+        assert [r.score for r in approx] == pytest.approx([r.score for r in exact])
+
+    def test_search_sees_writes_from_other_connection(self, temp_db):
+        """Commits made through another connection should invalidate the cache."""
+        query = np.random.rand(384).astype("float32")
+        assert temp_db.search(query) == []
+
+        other = SQLiteVectorStore(temp_db.db_path, dimension=384)
+        try:
+            doc = DocumentMetadata(
+                path=Path("/tmp/other.pdf"), title="Other", sha256="h", mtime=1.0, size=1
+            )
+            chunks = [ChunkRecord(document_path=doc.path, index=0, text="Text", metadata={})]
+            other.upsert_document(doc, chunks, np.random.rand(1, 384).astype("float32"))
+        finally:
+            other.close()
+
+        assert [r.title for r in temp_db.search(query)] == ["Other"]
 
 
 class TestIndexedDirectories:
@@ -490,6 +935,26 @@ class TestRemoveMissingFiles:
         cursor = temp_db.connection.execute("SELECT path FROM documents")
         assert cursor.fetchone()["path"] == str(real_file)
 
+    def test_remove_missing_files_shared_directory(self, temp_db, tmp_path):
+        """Only the deleted files in a directory should be removed."""
+        embeddings = np.random.rand(1, 384).astype("float32")
+        files = [tmp_path / f"doc{i}.pdf" for i in range(4)]
+        for i, f in enumerate(files):
+            f.write_text("test")
+            doc = DocumentMetadata(path=f, title=f.stem, sha256=f"h{i}", mtime=1.0, size=1)
+            chunks = [ChunkRecord(document_path=f, index=0, text="Text", metadata={})]
+            temp_db.upsert_document(doc, chunks, embeddings)
+        files[1].unlink()
+        files[3].unlink()
+
+        assert temp_db.remove_missing_files() == 2
+
+        remaining = {
+            row["title"] for row in temp_db.connection.execute("SELECT title FROM documents")
+        }
+        assert remaining == {"doc0", "doc2"}
+        assert temp_db.get_stats()["chunk_count"] == 2
+
     def test_remove_missing_cascades_chunks(self, temp_db):
         """Test that removing documents also removes chunks."""
         doc = DocumentMetadata(
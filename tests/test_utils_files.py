@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from docfinder.utils.files import compute_sha256, iter_pdf_paths
+from docfinder.utils.files import compute_sha256, compute_sha256_many, iter_pdf_paths
 
 
 class TestIterPdfPaths:
@@ -59,6 +59,18 @@ class TestIterPdfPaths:
         assert len(paths) >= 1  # At least one should be found
         assert all(p.suffix.lower() == ".pdf" for p in paths)
 
+    def test_nested_results_sorted_and_suffix_case_insensitive(self, tmp_path: Path) -> None:
+        """Directory walks should match suffixes case-insensitively and yield sorted paths."""
+        deep = tmp_path / "b" / "c"
+        deep.mkdir(parents=True)
+        (tmp_path / "z.pdf").write_text("z")
+        (deep / "UPPER.PDF").write_text("u")
+        (tmp_path / "a.pdf.txt").write_text("not a pdf")
+
+        paths = list(iter_pdf_paths([tmp_path]))
+
+        assert paths == sorted([tmp_path / "z.pdf", deep / "UPPER.PDF"])
+
     def test_empty_directory(self, tmp_path: Path) -> None:
         """Should handle empty directory."""
         paths = list(iter_pdf_paths([tmp_path]))
@@ -161,3 +173,23 @@ class TestComputeSha256:
         hash2 = compute_sha256(file2)
 
         assert hash1 != hash2
+
+
+class TestComputeSha256Many:
+    """Test compute_sha256_many function."""
+
+    def test_matches_single_file_hashes(self, tmp_path: Path) -> None:
+        """Should return the same digests as compute_sha256, keyed by path."""
+        files = []
+        for i in range(5):
+            f = tmp_path / f"file{i}.bin"
+            f.write_bytes(bytes([i]) * (1000 * (i + 1)))
+            files.append(f)
+
+        hashes = compute_sha256_many(files, max_workers=3)
+
+        assert hashes == {f: compute_sha256(f) for f in files}
+
+    def test_empty_input(self) -> None:
+        """Should return an empty mapping for no paths."""
+        assert compute_sha256_many([]) == {}
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from docfinder.utils.text import chunk_text, normalize_whitespace
+import pytest
+
+from docfinder.utils.text import (
+    chunk_text,
+    chunk_text_stream,
+    chunk_text_stream_paged,
+    normalize_whitespace,
+)
 
 
 class TestChunkText:
@@ -51,6 +58,95 @@ class TestChunkText:
         for chunk in chunks:
             assert len(chunk) <= 300
 
+    def test_chunk_rejects_overlap_not_smaller_than_max(self) -> None:
+        """Should raise instead of producing one window per character."""
+        with pytest.raises(ValueError, match="overlap"):
+            list(chunk_text("abc", max_chars=10, overlap=10))
+
+
+class TestChunkTextStream:
+    """Test streaming chunk_text_stream function."""
+
+    def test_stream_chunks_across_parts(self) -> None:
+        """Should produce overlapping windows regardless of part boundaries."""
+        text = "".join(chr(ord("a") + i % 26) for i in range(250))
+        parts = [text[:30], text[30:170], text[170:]]
+
+        chunks = list(chunk_text_stream(parts, max_chars=100, overlap=20))
+
+        assert chunks == [text[0:100], text[80:180], text[160:250]]
+
+    def test_stream_single_large_part(self) -> None:
+        """Should emit every window of a part much larger than max_chars."""
+        text = "x" * 1000
+        chunks = list(chunk_text_stream([text], max_chars=100, overlap=0))
+
+        assert len(chunks) == 10
+        assert all(len(c) == 100 for c in chunks)
+
+    def test_stream_empty(self) -> None:
+        """Should yield nothing for an empty stream."""
+        assert list(chunk_text_stream([], max_chars=100, overlap=10)) == []
+
+    def test_stream_rejects_overlap_not_smaller_than_max(self) -> None:
+        """Should raise like chunk_text instead of clamping the step to one."""
+        with pytest.raises(ValueError, match="overlap"):
+            list(chunk_text_stream(["abc"], max_chars=10, overlap=10))
+
+
+class TestChunkTextStreamPaged:
+    """Test sentence-aware paged chunking."""
+
+    def test_long_sentence_split_at_word_boundary(self) -> None:
+        """Should split a sentence longer than max_chars without cutting words."""
+        text = " ".join(["word"] * 100)  # 499 chars, no sentence punctuation
+        chunks = [c for c, _ in chunk_text_stream_paged([(1, text)], max_chars=100, overlap=0)]
+
+        assert len(chunks) > 1
+        assert all(len(c) <= 100 for c in chunks)
+        assert "".join(chunks) == text
+        assert all(c.endswith(" ") for c in chunks[:-1])
+
+    def test_long_sentence_prefers_clause_boundary(self) -> None:
+        """Should prefer clause punctuation over plain whitespace when splitting."""
+        text = "a" * 85 + "; " + "b " * 40
+        chunks = [c for c, _ in chunk_text_stream_paged([(1, text)], max_chars=100, overlap=0)]
+
+        assert chunks[0] == "a" * 85 + "; "
+
+    def test_sentence_separators_preserved(self) -> None:
+        """Joining chunks should reproduce the input, including inter-sentence spaces."""
+        text = "The first sentence is here. The second one follows!\n\nA new paragraph starts."
+        chunks = [c for c, _ in chunk_text_stream_paged([(1, text)], max_chars=40, overlap=0)]
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+
+    def test_unbreakable_text_hard_cut(self) -> None:
+        """Should fall back to a hard cut when no boundary exists."""
+        text = "x" * 250
+        chunks = [c for c, _ in chunk_text_stream_paged([(1, text)], max_chars=100, overlap=0)]
+
+        assert [len(c) for c in chunks] == [100, 100, 50]
+
+    def test_overlap_kept_when_sentences_exceed_budget(self) -> None:
+        """Sentences longer than the overlap should still leave a shared tail."""
+        text = "".join(
+            f"Sentence {i} " + " ".join(f"w{i}x{j}" for j in range(15)) + ". " for i in range(8)
+        )
+        chunks = [c for c, _ in chunk_text_stream_paged([(1, text)], max_chars=200, overlap=40)]
+
+        assert len(chunks) > 2
+        for prev, nxt in zip(chunks, chunks[1:]):
+            shared = max(k for k in range(41) if prev.endswith(nxt[:k]))
+            assert shared > 20
+            assert nxt[:shared].split()[0] in prev.split()
+
+    def test_rejects_overlap_not_smaller_than_max(self) -> None:
+        """Should raise like chunk_text and chunk_text_stream."""
+        with pytest.raises(ValueError, match="overlap"):
+            list(chunk_text_stream_paged([(1, "abc")], max_chars=10, overlap=10))
+
 
 class TestNormalizeWhitespace:
     """Test normalize_whitespace function."""
@@ -2,16 +2,76 @@
 
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
 import sys
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
+from urllib.parse import quote
 
 import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient, Response
 
-from docfinder.web.app import _ensure_db_parent, _resolve_db_path, app
+from docfinder.index.search import SearchResult
+from docfinder.web.app import (
+    _allowed_root,
+    _close_stores,
+    _ensure_db_parent,
+    _open_store,
+    _resolve_db_path,
+)
 
-client = TestClient(app)
+# Use real SearchResult instead of MagicMock so the response can be serialized
+_REAL_RESULT = SearchResult(
+    score=0.95,
+    path="/path/to/doc.pdf",
+    chunk_index=0,
+    text="Test content",
+    title="Test Document",
+    metadata={},
+)
+
+
+# A path that never exists, for tests that only need a missing file or DB
+# (no per-test tmp_path directory needed).
+_NONEXISTENT = "/nonexistent/docfinder_not_here_zzz.db"
+
+# Request bodies that don't depend on per-test paths, JSON-encoded once.
+_JSON_HEADERS = {"content-type": "application/json"}
+_ENCODED = {
+    "missing_db_search": json.dumps({"query": "test", "top_k": 10, "db": _NONEXISTENT}).encode(),
+}
+
+
+@lru_cache(maxsize=64)
+def _qpath(path: str) -> str:
+    """URL-encode *path* for a query string, memoized across tests."""
+    return quote(path, safe="")
+
+
+@pytest.fixture
+def mock_popen(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Stop /open from launching a real viewer."""
+    popen = MagicMock()
+    monkeypatch.setattr("subprocess.Popen", popen)
+    return popen
+
+
+@pytest.fixture(scope="module", autouse=True)
+def nonexistent_is_missing() -> None:
+    """Guard the tests that rely on ``_NONEXISTENT`` not being on disk."""
+    assert not os.path.exists(_NONEXISTENT)
+
+
+@pytest.fixture
+def allowed_root(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Confine /index to this test's tmp_path instead of the real home directory."""
+    monkeypatch.setenv("DOCFINDER_ALLOWED_ROOT", str(tmp_path))
+    return tmp_path
 
 
 class TestHelperFunctions:
@@ -22,9 +82,9 @@ class TestHelperFunctions:
         result = _resolve_db_path(None)
         assert isinstance(result, Path)
 
-    def test_resolve_db_path_with_path(self, tmp_path: Path) -> None:
+    def test_resolve_db_path_with_path(self) -> None:
         """Returns resolved path when db is provided."""
-        db_path = tmp_path / "custom.db"
+        db_path = Path(_NONEXISTENT)
         result = _resolve_db_path(db_path)
         assert result == db_path
 
@@ -35,185 +95,192 @@ class TestHelperFunctions:
         _ensure_db_parent(db_path)
         assert db_path.parent.exists()
 
+    def test_allowed_root_defaults_to_home(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Uses the home directory unless DOCFINDER_ALLOWED_ROOT is set."""
+        monkeypatch.delenv("DOCFINDER_ALLOWED_ROOT", raising=False)
+        assert _allowed_root() == Path(os.path.realpath(Path.home()))
 
-class TestSystemInfoEndpoint:
-    """Tests for GET /system/info endpoint."""
+    def test_open_store_reused_across_requests(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """The shared connection outlives each request's close until shutdown."""
+        monkeypatch.setattr("docfinder.web.app._embedder", SimpleNamespace(dimension=4))
+        db_path = tmp_path / "shared.db"
 
-    def test_system_info_contains_runtime_fields(self) -> None:
-        """Returns memory + runtime backend/indexing details."""
-        response = client.get("/system/info")
-        assert response.status_code == 200
-        data = response.json()
-        assert "available_mb" in data
-        assert "total_mb" in data
-        assert "selected_backend" in data
-        assert "selected_device" in data
-        assert "indexing_mode" in data
+        first = _open_store(db_path)
+        first.close()
+        second = _open_store(db_path)
+        try:
+            assert second is first
+            second.connection.execute("SELECT 1")
+        finally:
+            second.close()
+            _close_stores()
 
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.connection.execute("SELECT 1")
 
-class TestSearchEndpoint:
-    """Tests for POST /search endpoint."""
+    def test_open_store_evicts_least_recently_used(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Only the most recent databases stay pinned; evicted ones are closed."""
+        monkeypatch.setattr("docfinder.web.app._embedder", SimpleNamespace(dimension=4))
+        monkeypatch.setattr("docfinder.web.app._PINNED_STORES_MAX", 1)
+
+        old = _open_store(tmp_path / "old.db")
+        old.close()
+        new = _open_store(tmp_path / "new.db")
+        new.close()
+        try:
+            new.connection.execute("SELECT 1")
+            with pytest.raises(sqlite3.ProgrammingError):
+                old.connection.execute("SELECT 1")
+        finally:
+            _close_stores()
 
-    def test_search_empty_query(self) -> None:
-        """Returns 400 for empty query."""
-        response = client.post("/search", json={"query": "", "top_k": 10})
-        assert response.status_code == 400
-        assert "Empty query" in response.json()["detail"]
 
-    def test_search_whitespace_query(self) -> None:
-        """Returns 400 for whitespace-only query."""
-        response = client.post("/search", json={"query": "   ", "top_k": 10})
-        assert response.status_code == 400
-        assert "Empty query" in response.json()["detail"]
-
-    def test_search_database_not_found(self, tmp_path: Path) -> None:
-        """Returns 404 when database doesn't exist."""
-        db_path = tmp_path / "nonexistent.db"
-        response = client.post("/search", json={"query": "test", "db": str(db_path), "top_k": 10})
-        assert response.status_code == 404
-        assert "Database not found" in response.json()["detail"]
+class TestSystemInfoEndpoint:
+    """Tests for GET /system/info endpoint."""
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
-    @patch("docfinder.web.app.Searcher")
-    def test_search_success(
+    def test_system_info_contains_runtime_fields(self, client: TestClient) -> None:
+        """Returns memory + runtime backend/indexing details."""
+        response = client.get("/system/info")
+        assert response.status_code == 200
+        body = response.json()
+        assert "available_mb" in body
+        assert "total_mb" in body
+        assert "selected_backend" in body
+        assert "selected_device" in body
+        assert "indexing_mode" in body
+
+
+class TestDatabaseNotFound:
+    """Tests for endpoints given a database path that doesn't exist."""
+
+    @pytest.mark.parametrize(
+        ("method", "url", "payload", "expected_status"),
+        [
+            ("POST", "/search", _ENCODED["missing_db_search"], 404),
+            ("GET", "/documents?db={db}", None, 200),
+            ("DELETE", "/documents/1?db={db}", None, 404),
+            ("DELETE", "/documents/cleanup?db={db}", None, 404),
+        ],
+        ids=["search", "documents", "delete", "cleanup"],
+    )
+    @pytest.mark.anyio
+    async def test_database_not_found(
         self,
-        mock_searcher_class: MagicMock,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        method: str,
+        url: str,
+        payload: bytes | None,
+        expected_status: int,
+        aclient: AsyncClient,
     ) -> None:
-        """Returns search results on success."""
-        from docfinder.index.search import SearchResult
-
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store_class.return_value = mock_store
-
-        # Use real SearchResult instead of MagicMock
-        real_result = SearchResult(
-            score=0.95,
-            path="/path/to/doc.pdf",
-            chunk_index=0,
-            text="Test content",
-            title="Test Document",
-            metadata={},
+        """Returns 404, or an empty listing for /documents, when the DB is missing."""
+        # URL encode the path to handle special characters
+        response = await aclient.request(
+            method,
+            url.format(db=_qpath(_NONEXISTENT)),
+            content=payload,
+            headers=_JSON_HEADERS if payload is not None else None,
         )
+        assert response.status_code == expected_status
+        body = response.json()
+        if expected_status == 404:
+            assert "Database not found" in body["detail"]
+        else:
+            assert body["documents"] == []
+            assert body["stats"]["document_count"] == 0
 
-        mock_searcher = MagicMock()
-        mock_searcher.search.return_value = [real_result]
-        mock_searcher_class.return_value = mock_searcher
 
-        response = client.post("/search", json={"query": "test", "db": str(db_path), "top_k": 10})
-        assert response.status_code == 200
-        assert "results" in response.json()
+class TestSearchEndpoint:
+    """Tests for POST /search endpoint."""
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
-    @patch("docfinder.web.app.Searcher")
-    def test_search_clamps_top_k(
+    @pytest.mark.parametrize(
+        ("query", "top_k", "expected_status", "detail", "expected_top_k"),
+        [
+            ("", 10, 400, "Empty query", None),
+            ("   ", 10, 400, "Empty query", None),
+            ("test", 100, 200, None, 50),
+            ("test", 0, 200, None, 1),
+        ],
+        ids=["empty", "whitespace", "clamp-high", "clamp-low"],
+    )
+    @pytest.mark.anyio
+    async def test_search_validates_query_and_top_k(
         self,
-        mock_searcher_class: MagicMock,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        query: str,
+        top_k: int,
+        expected_status: int,
+        detail: str | None,
+        expected_top_k: int | None,
+        mock_stack: SimpleNamespace,
+        dummy_db: Path,
+        aclient: AsyncClient,
     ) -> None:
-        """Clamps top_k to valid range."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
+        """Rejects blank queries and clamps top_k to the 1..50 range."""
+        mock_stack.searcher.search.return_value = []
 
-        mock_store = MagicMock()
-        mock_store_class.return_value = mock_store
+        response = await aclient.post(
+            "/search", json={"query": query, "db": str(dummy_db), "top_k": top_k}
+        )
+        body = response.json()
+        assert response.status_code == expected_status
+        if detail is not None:
+            assert detail in body["detail"]
+            mock_stack.searcher.search.assert_not_called()
+        else:
+            mock_stack.searcher.search.assert_called_with(query, top_k=expected_top_k, folders=None)
 
-        mock_searcher = MagicMock()
-        mock_searcher.search.return_value = []
-        mock_searcher_class.return_value = mock_searcher
+    def test_search_success(
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
+    ) -> None:
+        """Returns search results on success."""
+        mock_stack.searcher.search.return_value = [_REAL_RESULT]
 
-        # Test with top_k > 50
-        response = client.post("/search", json={"query": "test", "db": str(db_path), "top_k": 100})
+        response = client.post("/search", json={"query": "test", "db": str(dummy_db), "top_k": 10})
+        body = response.json()
         assert response.status_code == 200
-        mock_searcher.search.assert_called_with("test", top_k=50, folders=None)
+        assert "results" in body
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
-    @patch("docfinder.web.app.Searcher")
     def test_search_passes_folder_filters(
-        self,
-        mock_searcher_class: MagicMock,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Passes selected folder filters to Searcher."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store_class.return_value = mock_store
-
-        mock_searcher = MagicMock()
-        mock_searcher.search.return_value = []
-        mock_searcher_class.return_value = mock_searcher
+        mock_stack.searcher.search.return_value = []
 
         folders = ["/Users/test/articles", "/Users/test/posters"]
         response = client.post(
             "/search",
-            json={"query": "test", "db": str(db_path), "top_k": 10, "folders": folders},
+            json={"query": "test", "db": str(dummy_db), "top_k": 10, "folders": folders},
         )
         assert response.status_code == 200
-        mock_searcher.search.assert_called_with("test", top_k=10, folders=folders)
+        mock_stack.searcher.search.assert_called_with("test", top_k=10, folders=folders)
 
 
 class TestSearchFoldersEndpoint:
     """Tests for GET /search/folders endpoint."""
 
-    def test_search_folders_database_not_found(self, tmp_path: Path) -> None:
+    def test_search_folders_database_not_found(self, client: TestClient) -> None:
         """Returns empty folders list when DB is missing."""
-        db_path = tmp_path / "missing.db"
-        response = client.get(f"/search/folders?db={db_path}")
+        response = client.get(f"/search/folders?db={_qpath(_NONEXISTENT)}")
+        body = response.json()
         assert response.status_code == 200
-        assert response.json() == {"folders": []}
+        assert body == {"folders": []}
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_search_folders_success(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Returns indexed folder list with counts."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.list_indexed_directories.return_value = [
+        mock_stack.store.list_indexed_directories.return_value = [
             {"path": "/Users/test/articles", "document_count": 7},
             {"path": "/Users/test/posters", "document_count": 2},
         ]
-        mock_store_class.return_value = mock_store
 
-        response = client.get(f"/search/folders?db={db_path}")
+        response = client.get(f"/search/folders?db={dummy_db}")
+        body = response.json()
         assert response.status_code == 200
-        assert response.json() == {
+        assert body == {
             "folders": [
                 {"path": "/Users/test/articles", "document_count": 7},
                 {"path": "/Users/test/posters", "document_count": 2},
@@ -224,279 +291,192 @@ class TestSearchFoldersEndpoint:
 class TestOpenEndpoint:
     """Tests for POST /open endpoint."""
 
-    def test_open_file_not_found(self, tmp_path: Path) -> None:
+    def test_open_file_not_found(self, client: TestClient) -> None:
         """Returns 404 when file doesn't exist."""
-        response = client.post("/open", json={"path": str(tmp_path / "nonexistent.pdf")})
+        response = client.post("/open", json={"path": _NONEXISTENT})
+        body = response.json()
         assert response.status_code == 404
-        assert "File not found" in response.json()["detail"]
+        assert "File not found" in body["detail"]
 
     @pytest.mark.skipif(sys.platform == "win32", reason="POSIX-only test")
-    @patch("subprocess.Popen")
-    def test_open_file_success_posix(self, mock_popen: MagicMock, tmp_path: Path) -> None:
+    def test_open_file_success_posix(
+        self,
+        mock_popen: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        client: TestClient,
+    ) -> None:
         """Opens file on POSIX systems."""
         test_file = tmp_path / "test.pdf"
         test_file.touch()
+        monkeypatch.setattr(os, "name", "posix")
+        monkeypatch.setattr(sys, "platform", "darwin")
 
-        with patch("os.name", "posix"):
-            with patch("sys.platform", "darwin"):
-                response = client.post("/open", json={"path": str(test_file)})
-                assert response.status_code == 200
-                assert response.json()["status"] == "ok"
+        response = client.post("/open", json={"path": str(test_file)})
+        body = response.json()
+        assert response.status_code == 200
+        assert body["status"] == "ok"
+        mock_popen.assert_called_once_with(["open", str(test_file)])
 
 
 class TestDocumentsEndpoint:
     """Tests for GET /documents endpoint."""
 
-    def test_documents_database_not_found(self, tmp_path: Path) -> None:
-        """Returns empty list when database doesn't exist."""
-        db_path = tmp_path / "nonexistent.db"
-        response = client.get(f"/documents?db={db_path}")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["documents"] == []
-        assert data["stats"]["document_count"] == 0
-
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_documents_success(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Returns document list on success."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.list_documents.return_value = [{"id": 1, "path": "/doc.pdf", "title": "Test"}]
-        mock_store.get_stats.return_value = {
+        mock_stack.store.list_documents.return_value = [
+            {"id": 1, "path": "/doc.pdf", "title": "Test"}
+        ]
+        mock_stack.store.get_stats.return_value = {
             "document_count": 1,
             "chunk_count": 5,
             "total_size_bytes": 1024,
         }
-        mock_store_class.return_value = mock_store
 
-        response = client.get(f"/documents?db={db_path}")
+        response = client.get(f"/documents?db={dummy_db}")
         assert response.status_code == 200
-        data = response.json()
-        assert len(data["documents"]) == 1
-        assert data["stats"]["document_count"] == 1
+        body = response.json()
+        assert len(body["documents"]) == 1
+        assert body["stats"]["document_count"] == 1
 
 
 class TestDeleteDocumentEndpoint:
     """Tests for DELETE /documents/{doc_id} endpoint."""
 
-    def test_delete_database_not_found(self, tmp_path: Path) -> None:
-        """Returns 404 when database doesn't exist."""
-        db_path = tmp_path / "nonexistent.db"
-        response = client.delete(f"/documents/1?db={db_path}")
-        assert response.status_code == 404
-        assert "Database not found" in response.json()["detail"]
-
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_delete_document_not_found(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Returns 404 when document doesn't exist."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
+        mock_stack.store.delete_document.return_value = False
 
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.delete_document.return_value = False
-        mock_store_class.return_value = mock_store
-
-        response = client.delete(f"/documents/999?db={db_path}")
+        response = client.delete(f"/documents/999?db={dummy_db}")
+        body = response.json()
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
+        assert "not found" in body["detail"]
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_delete_document_success(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Successfully deletes document."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.delete_document.return_value = True
-        mock_store_class.return_value = mock_store
+        mock_stack.store.delete_document.return_value = True
 
-        response = client.delete(f"/documents/1?db={db_path}")
+        response = client.delete(f"/documents/1?db={dummy_db}")
+        body = response.json()
         assert response.status_code == 200
-        assert response.json()["status"] == "ok"
+        assert body["status"] == "ok"
 
 
 class TestDeleteDocumentByPathEndpoint:
     """Tests for POST /documents/delete endpoint."""
 
-    def test_delete_no_identifier(self) -> None:
+    def test_delete_no_identifier(self, client: TestClient) -> None:
         """Returns 400 when neither doc_id nor path provided."""
         response = client.post("/documents/delete", json={})
+        body = response.json()
         assert response.status_code == 400
-        assert "Either doc_id or path" in response.json()["detail"]
+        assert "Either doc_id or path" in body["detail"]
 
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_delete_by_path_success(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Successfully deletes document by path."""
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.delete_document_by_path.return_value = True
-        mock_store_class.return_value = mock_store
+        mock_stack.store.delete_document_by_path.return_value = True
 
-        response = client.post(f"/documents/delete?db={db_path}", json={"path": "/path/to/doc.pdf"})
+        response = client.post(
+            f"/documents/delete?db={dummy_db}", json={"path": "/path/to/doc.pdf"}
+        )
+        body = response.json()
         assert response.status_code == 200
-        assert response.json()["status"] == "ok"
+        assert body["status"] == "ok"
 
 
 class TestCleanupEndpoint:
     """Tests for DELETE /documents/cleanup endpoint."""
 
-    def test_cleanup_database_not_found(self, tmp_path: Path) -> None:
-        """Returns 404 when database doesn't exist."""
-        from urllib.parse import quote
-
-        db_path = tmp_path / "nonexistent.db"
-        # URL encode the path to handle special characters
-        encoded_path = quote(str(db_path), safe="")
-        response = client.delete(f"/documents/cleanup?db={encoded_path}")
-        assert response.status_code == 404
-        assert "Database not found" in response.json()["detail"]
-
-    @patch("docfinder.web.app.EmbeddingModel")
-    @patch("docfinder.web.app.SQLiteVectorStore")
     def test_cleanup_success(
-        self,
-        mock_store_class: MagicMock,
-        mock_embedder_class: MagicMock,
-        tmp_path: Path,
+        self, mock_stack: SimpleNamespace, dummy_db: Path, client: TestClient
     ) -> None:
         """Successfully removes missing files."""
-        from urllib.parse import quote
+        mock_stack.store.remove_missing_files.return_value = 2
 
-        db_path = tmp_path / "test.db"
-        db_path.touch()
-
-        mock_embedder = MagicMock()
-        mock_embedder.dimension = 768
-        mock_embedder_class.return_value = mock_embedder
-
-        mock_store = MagicMock()
-        mock_store.remove_missing_files.return_value = 2
-        mock_store_class.return_value = mock_store
-
-        encoded_path = quote(str(db_path), safe="")
+        encoded_path = _qpath(str(dummy_db))
         response = client.delete(f"/documents/cleanup?db={encoded_path}")
+        body = response.json()
         assert response.status_code == 200
-        assert response.json()["removed_count"] == 2
+        assert body["removed_count"] == 2
 
 
 class TestIndexEndpoint:
     """Tests for POST /index endpoint."""
 
-    def test_index_no_paths(self) -> None:
+    def test_index_no_paths(self, client: TestClient) -> None:
         """Returns 400 when no paths provided."""
         response = client.post("/index", json={"paths": []})
+        body = response.json()
         assert response.status_code == 400
-        assert "No path provided" in response.json()["detail"]
+        assert "No path provided" in body["detail"]
 
-    def test_index_null_byte_in_path(self) -> None:
+    def test_index_null_byte_in_path(self, client: TestClient) -> None:
         """Returns 400 for path with null byte."""
         response = client.post("/index", json={"paths": ["/path/with\x00null"]})
+        body = response.json()
         assert response.status_code == 400
-        assert "null byte" in response.json()["detail"]
+        assert "null byte" in body["detail"]
 
-    def test_index_path_not_found(self, tmp_path: Path) -> None:
-        """Returns error for nonexistent path (403 if outside home, 404 if inside)."""
-        # Create path inside home directory that doesn't exist
-        fake_path = Path.home() / "docfinder_test_nonexistent_12345"
+    def test_index_path_not_found(self, allowed_root: Path, client: TestClient) -> None:
+        """Returns 404 for a nonexistent path inside the allowed root."""
+        fake_path = allowed_root / "docfinder_test_nonexistent"
         response = client.post("/index", json={"paths": [str(fake_path)]})
-        # Should be 404 because path is inside home but doesn't exist
+        body = response.json()
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
+        assert "not found" in body["detail"].lower()
 
-    def test_index_path_not_directory(self, tmp_path: Path) -> None:
+    def test_index_path_not_directory(self, allowed_root: Path, client: TestClient) -> None:
         """Returns 400 when path is a file, not directory."""
-        # Create file inside home directory
-        file_path = Path.home() / "docfinder_test_file_12345.txt"
+        file_path = allowed_root / "f.txt"
         file_path.touch()
-        try:
-            response = client.post("/index", json={"paths": [str(file_path)]})
-            assert response.status_code == 400
-            assert "must be a directory" in response.json()["detail"]
-        finally:
-            file_path.unlink()
+        response = client.post("/index", json={"paths": [str(file_path)]})
+        body = response.json()
+        assert response.status_code == 400
+        assert "must be a directory" in body["detail"]
 
-    def test_index_path_outside_home(self, tmp_path: Path) -> None:
-        """Returns 403 for path outside home directory."""
-        # Try to access /etc which is definitely outside home
+    def test_index_path_outside_home(self, allowed_root: Path, client: TestClient) -> None:
+        """Returns 403 for path outside the allowed root."""
+        # /etc is outside both the home directory and the per-test root
         response = client.post("/index", json={"paths": ["/etc"]})
+        body = response.json()
         assert response.status_code == 403
-        assert "outside allowed directory" in response.json()["detail"]
+        assert "outside allowed directory" in body["detail"]
 
     @patch("docfinder.web.app._run_index_job")
     def test_index_success(
-        self, mock_run_index: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, mock_run_index: MagicMock, allowed_root: Path, client: TestClient
     ) -> None:
         """Successfully indexes directory."""
-        # Create a subdirectory inside home
-        test_dir = Path.home() / "DocFinder_test_temp"
-        test_dir.mkdir(exist_ok=True)
+        mock_run_index.return_value = {
+            "inserted": 1,
+            "updated": 0,
+            "skipped": 0,
+            "failed": 0,
+            "processed_files": [],
+        }
 
-        try:
-            mock_run_index.return_value = {
-                "inserted": 1,
-                "updated": 0,
-                "skipped": 0,
-                "failed": 0,
-                "processed_files": [],
-            }
-
-            response = client.post("/index", json={"paths": [str(test_dir)]})
-            assert response.status_code == 200
-            assert response.json()["status"] == "ok"
-        finally:
-            test_dir.rmdir()
+        test_dir = allowed_root / "docs"
+        test_dir.mkdir()
+
+        response = client.post("/index", json={"paths": [str(test_dir)]})
+        body = response.json()
+        assert response.status_code == 200
+        assert body["status"] == "ok"
 
 
 class TestFrontendRouter:
     """Tests for the frontend HTML routes."""
 
-    def test_index_page(self) -> None:
+    def test_index_page(self, index_html: Response) -> None:
         """Returns HTML for index page."""
-        response = client.get("/")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-        assert "DocFinder" in response.text
+        assert index_html.status_code == 200
+        assert "text/html" in index_html.headers["content-type"]
+        assert b"DocFinder" in index_html.content